@@ -0,0 +1,188 @@
+import copy
+import random
+import sys
+import time
+
+import numpy as np
+
+from core.const import *
+from core.piece import *
+from core.board import Board
+from core.evaluation import MG_SCORES, EG_SCORES, PHASES, MAX_PHASE, taper
+
+
+#код фигуры в массиве: 0 - пусто, 1-6 белые, 7-12 черные (пешка, конь, слон, ладья, ферзь, король)
+KINDS = (Pawn, Knight, Bishop, Rook, Queen, King)
+CODES = {
+    (kind, color): side * 6 + index + 1
+    for side, color in enumerate(('white', 'black'))
+    for index, kind in enumerate(KINDS)
+}
+
+#за каждое поле куда может пойти конь, слон, ладья или ферзь
+MOBILITY_WEIGHT = 4
+
+#таблицы [код фигуры, поле] для оценки всех позиций одной индексацией
+MG_TABLE = np.zeros((13, 64), dtype=np.int32)
+EG_TABLE = np.zeros((13, 64), dtype=np.int32)
+PHASE_TABLE = np.zeros(13, dtype=np.int32)
+for (kind, color), code in CODES.items():
+    MG_TABLE[code] = MG_SCORES[kind, color]
+    EG_TABLE[code] = EG_SCORES[kind, color]
+    PHASE_TABLE[code] = PHASES[kind]
+
+SQUARE_INDEX = np.arange(64)
+
+
+def encode(boards):
+    '''Переводит доски в массивы: поля (N, 64) с кодами фигур и очередь хода (N,) 1 - белые, -1 - черные'''
+    codes = []
+    for board in boards:
+        codes.extend([
+            0 if (piece := square.piece) is None else CODES[type(piece), piece.color]
+            for row in board.squares
+            for square in row
+        ])
+    squares = np.array(codes, dtype=np.int8).reshape(len(boards), 64)
+    turns = np.array([1 if board.next_player == 'white' else -1 for board in boards], dtype=np.int32)
+    return squares, turns
+
+
+def _shift(masks, row_incr, col_incr):
+    #сдвиг масок (N, 8, 8) на (row_incr, col_incr), ушедшее за край пропадает
+    shifted = np.zeros_like(masks)
+    rows_from, rows_to = slice(max(0, -row_incr), ROWS - max(0, row_incr)), slice(max(0, row_incr), ROWS - max(0, -row_incr))
+    cols_from, cols_to = slice(max(0, -col_incr), COLS - max(0, col_incr)), slice(max(0, col_incr), COLS - max(0, -col_incr))
+    shifted[:, rows_to, cols_to] = masks[:, rows_from, cols_from]
+    return shifted
+
+
+def _mobility(boards, side):
+    #число полей (пустых или с фигурой соперника) куда ходят легкие и тяжелые фигуры стороны
+    first = side * 6 + 1
+    own = (boards >= first) & (boards < first + 6)
+    targets = ~own
+    empty = boards == 0
+    count = np.zeros(boards.shape, dtype=np.int16)
+
+    knights = boards == first + 1
+    for row_incr, col_incr in KNIGHT_INCRS:
+        count += _shift(knights, row_incr, col_incr) & targets
+
+    queens = boards == first + 4
+    for sliders, incrs in (
+        ((boards == first + 2) | queens, BISHOP_INCRS),
+        ((boards == first + 3) | queens, ROOK_INCRS),
+    ):
+        for row_incr, col_incr in incrs:
+            front = sliders
+            for step in range(7):
+                front = _shift(front, row_incr, col_incr)
+                count += front & targets
+                #луч идет дальше только через пустые поля
+                front &= empty
+                if not front.any():
+                    break
+
+    return count.sum(axis=(1, 2), dtype=np.int32)
+
+
+def evaluate_encoded(squares, turns):
+    '''Оценки (N,) со стороны того кто ходит: материал и поля фигур по стадии игры плюс подвижность'''
+    mg = MG_TABLE[squares, SQUARE_INDEX].sum(axis=1)
+    eg = EG_TABLE[squares, SQUARE_INDEX].sum(axis=1)
+    phase = np.minimum(PHASE_TABLE[squares].sum(axis=1), MAX_PHASE)
+    score = (mg * phase + eg * (MAX_PHASE - phase)) // MAX_PHASE
+
+    boards = squares.reshape(-1, ROWS, COLS)
+    score += MOBILITY_WEIGHT * (_mobility(boards, 0) - _mobility(boards, 1))
+    return score * turns
+
+
+def evaluate_batch(boards):
+    '''Оценивает список досок Board одним вызовом'''
+    return evaluate_encoded(*encode(boards))
+
+
+def evaluate_position(board):
+    '''То же для одной позиции на чистом Python (для сверки и сравнения скорости)'''
+    mg = eg = phase = 0
+    mobility = 0
+    for row in range(ROWS):
+        for col in range(COLS):
+            piece = board.squares[row][col].piece
+            if piece is None:
+                continue
+            key = type(piece), piece.color
+            mg += MG_SCORES[key][row * 8 + col]
+            eg += EG_SCORES[key][row * 8 + col]
+            phase += PHASES[type(piece)]
+
+            sign = 1 if piece.color == 'white' else -1
+            if isinstance(piece, Knight):
+                for row_incr, col_incr in KNIGHT_INCRS:
+                    r, c = row + row_incr, col + col_incr
+                    if 0 <= r < ROWS and 0 <= c < COLS and board.squares[r][c].isempty_or_rival(piece.color):
+                        mobility += sign
+            elif isinstance(piece, (Bishop, Rook, Queen)):
+                incrs = ()
+                if not isinstance(piece, Rook):
+                    incrs += BISHOP_INCRS
+                if not isinstance(piece, Bishop):
+                    incrs += ROOK_INCRS
+                for row_incr, col_incr in incrs:
+                    r, c = row + row_incr, col + col_incr
+                    while 0 <= r < ROWS and 0 <= c < COLS:
+                        square = board.squares[r][c]
+                        if square.isempty_or_rival(piece.color):
+                            mobility += sign
+                        if square.has_piece():
+                            break
+                        r, c = r + row_incr, c + col_incr
+
+    score = taper(mg, eg, phase) + MOBILITY_WEIGHT * mobility
+    return score if board.next_player == 'white' else -score
+
+
+def random_positions(count, seed=0):
+    '''Позиции из случайных партий (копии досок)'''
+    rng = random.Random(seed)
+    boards = []
+    board = Board()
+    while len(boards) < count:
+        moves = board.legal_moves(board.next_player)
+        if not moves or len(board._history) >= 120:
+            board = Board()
+            continue
+        move = rng.choice(moves)
+        board.make_move(board.squares[move.initial.row][move.initial.col].piece, move)
+        boards.append(copy.deepcopy(board))
+    return boards
+
+
+def bench(count=50000, distinct=2000):
+    '''Позиций в секунду: по одной на Python и пачкой на NumPy'''
+    positions = random_positions(distinct)
+    boards = [positions[index % distinct] for index in range(count)]
+
+    start = time.perf_counter()
+    expected = [evaluate_position(board) for board in boards]
+    python_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    squares, turns = encode(boards)
+    encode_time = time.perf_counter() - start
+    scores = evaluate_encoded(squares, turns)
+    batch_time = time.perf_counter() - start
+
+    if scores.tolist() != expected:
+        raise AssertionError('оценки NumPy и Python не совпали')
+    return python_time, encode_time, batch_time
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    python_time, encode_time, batch_time = bench(count)
+    print(f'python, one by one:  {count / python_time:10.0f} positions/s')
+    print(f'numpy batch:         {count / batch_time:10.0f} positions/s (encode {encode_time:.3f} s of {batch_time:.3f} s)')
+    print(f'speedup:             {python_time / batch_time:10.1f}x')
@@ -0,0 +1,416 @@
+from core.const import *
+from core.piece import *
+from core.move import Move
+
+
+#виды фигур (индекс битборда = цвет * 6 + вид)
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+WHITE, BLACK = 0, 1
+KINDS = {Pawn: PAWN, Knight: KNIGHT, Bishop: BISHOP, Rook: ROOK, Queen: QUEEN, King: KING}
+
+#флаги хода (биты 12-14): код хода = from | to << 6 | flag << 12
+NORMAL, DOUBLE_PUSH, EN_PASSANT, CASTLE, PROMOTION = range(5)
+
+#поле = row * 8 + col, нулевая строка - восьмая горизонталь
+FULL = (1 << 64) - 1
+FILE_A = sum(1 << (row * 8) for row in range(8))
+FILE_H = FILE_A << 7
+NOT_A = FULL ^ FILE_A
+NOT_H = FULL ^ FILE_H
+ROW_3 = 0xFF << (5 * 8)
+ROW_6 = 0xFF << (2 * 8)
+
+
+def _steps(incrs):
+    table = []
+    for sqr in range(64):
+        row, col = divmod(sqr, 8)
+        bb = 0
+        for row_incr, col_incr in incrs:
+            r, c = row + row_incr, col + col_incr
+            if 0 <= r < 8 and 0 <= c < 8:
+                bb |= 1 << (r * 8 + c)
+        table.append(bb)
+    return table
+
+
+def _rays(row_incr, col_incr):
+    table = []
+    for sqr in range(64):
+        row, col = divmod(sqr, 8)
+        bb = 0
+        r, c = row + row_incr, col + col_incr
+        while 0 <= r < 8 and 0 <= c < 8:
+            bb |= 1 << (r * 8 + c)
+            r, c = r + row_incr, c + col_incr
+        table.append(bb)
+    return table
+
+
+KNIGHT_ATTACKS = _steps(KNIGHT_INCRS)
+KING_ATTACKS = _steps(KING_INCRS)
+
+#лучи в сторону возрастания индекса (первый блокер - младший бит) и убывания (старший бит)
+ROOK_RAYS_UP = [_rays(1, 0), _rays(0, 1)]
+ROOK_RAYS_DOWN = [_rays(-1, 0), _rays(0, -1)]
+BISHOP_RAYS_UP = [_rays(1, 1), _rays(1, -1)]
+BISHOP_RAYS_DOWN = [_rays(-1, 1), _rays(-1, -1)]
+
+#все поля на одной линии с полем (для быстрой проверки возможной связки)
+LINES = [
+    sum(rays[sqr] for rays in ROOK_RAYS_UP + ROOK_RAYS_DOWN + BISHOP_RAYS_UP + BISHOP_RAYS_DOWN)
+    for sqr in range(64)
+]
+
+#маска прав на рокировку которая остается после хода с поля / на поле
+CASTLE_MASK = [15] * 64
+CASTLE_MASK[60] = 15 ^ (WHITE_OO | WHITE_OOO)
+CASTLE_MASK[63] = 15 ^ WHITE_OO
+CASTLE_MASK[56] = 15 ^ WHITE_OOO
+CASTLE_MASK[4] = 15 ^ (BLACK_OO | BLACK_OOO)
+CASTLE_MASK[7] = 15 ^ BLACK_OO
+CASTLE_MASK[0] = 15 ^ BLACK_OOO
+
+
+def _slider_attacks(sqr, occ, rays_up, rays_down):
+    attacks = 0
+    for rays in rays_up:
+        ray = rays[sqr]
+        blockers = ray & occ
+        if blockers:
+            ray ^= rays[(blockers & -blockers).bit_length() - 1]
+        attacks |= ray
+    for rays in rays_down:
+        ray = rays[sqr]
+        blockers = ray & occ
+        if blockers:
+            ray ^= rays[blockers.bit_length() - 1]
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sqr, occ):
+    return _slider_attacks(sqr, occ, ROOK_RAYS_UP, ROOK_RAYS_DOWN)
+
+
+def bishop_attacks(sqr, occ):
+    return _slider_attacks(sqr, occ, BISHOP_RAYS_UP, BISHOP_RAYS_DOWN)
+
+
+def _bits(bb):
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+class BitBoard:
+    '''Компактная позиция на 64-битных масках: второй генератор ходов для проверки и замеров perft
+
+    Engine работает на Board: хэш, оценка, SEE, сортировка ходов и таблицы эндшпиля читают Board.squares.
+    '''
+
+    def __init__(self):
+        self.bbs = [0] * 12
+        self.occ = [0, 0]
+        #вид фигуры на каждом поле (-1 - пусто)
+        self.mailbox = [-1] * 64
+        self.next_player = 'white'
+        self.castling = WHITE_OO | WHITE_OOO | BLACK_OO | BLACK_OOO
+        self.en_passant = -1
+        self._history = []
+
+        for col, kind in enumerate((ROOK, KNIGHT, BISHOP, QUEEN, KING, BISHOP, KNIGHT, ROOK)):
+            self._put(BLACK * 6 + kind, col)
+            self._put(BLACK * 6 + PAWN, 8 + col)
+            self._put(WHITE * 6 + PAWN, 48 + col)
+            self._put(WHITE * 6 + kind, 56 + col)
+
+    @classmethod
+    def from_board(cls, board, color='white'):
+        '''Переносит позицию обычной доски Board (ход стороны color)'''
+        bitboard = cls()
+        bitboard.bbs = [0] * 12
+        bitboard.occ = [0, 0]
+        bitboard.mailbox = [-1] * 64
+        bitboard.next_player = color
+        bitboard.en_passant = -1
+
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = board.squares[row][col].piece
+                if piece is None:
+                    continue
+                side = WHITE if piece.color == 'white' else BLACK
+                bitboard._put(side * 6 + KINDS[type(piece)], row * 8 + col)
+                if piece is board.en_passant_pawn:
+                    bitboard.en_passant = (row - piece.dir) * 8 + col
+
+        bitboard.castling = board.castling_rights()
+
+        return bitboard
+
+    def _put(self, index, sqr):
+        self.bbs[index] |= 1 << sqr
+        self.occ[index // 6] |= 1 << sqr
+        self.mailbox[sqr] = index
+
+    def attacked(self, sqr, side):
+        '''Бьет ли сторона side поле sqr'''
+        bbs = self.bbs
+        base = side * 6
+        if KNIGHT_ATTACKS[sqr] & bbs[base + KNIGHT]:
+            return True
+        if KING_ATTACKS[sqr] & bbs[base + KING]:
+            return True
+
+        #пешки side бьют sqr если стоят на его "пешечных" полях со стороны противника
+        bit = 1 << sqr
+        if side == WHITE:
+            pawn_sqrs = ((bit & NOT_A) << 7 | (bit & NOT_H) << 9) & FULL
+        else:
+            pawn_sqrs = (bit & NOT_A) >> 9 | (bit & NOT_H) >> 7
+        if pawn_sqrs & bbs[base + PAWN]:
+            return True
+
+        occ = self.occ[0] | self.occ[1]
+        queens = bbs[base + QUEEN]
+        if rook_attacks(sqr, occ) & (bbs[base + ROOK] | queens):
+            return True
+        if bishop_attacks(sqr, occ) & (bbs[base + BISHOP] | queens):
+            return True
+
+        return False
+
+    def in_check(self, color=None):
+        color = color or self.next_player
+        side = WHITE if color == 'white' else BLACK
+        king = self.bbs[side * 6 + KING]
+        return self.attacked(king.bit_length() - 1, side ^ 1)
+
+    def pseudo_moves(self):
+        '''Все ходы стороны без проверки шаха (коды ходов)'''
+        side = WHITE if self.next_player == 'white' else BLACK
+        bbs = self.bbs
+        base = side * 6
+        own = self.occ[side]
+        rival = self.occ[side ^ 1]
+        occ = own | rival
+        empty = FULL ^ occ
+        moves = []
+        add = moves.append
+
+        #пешки - сдвигом всех пешек сразу
+        pawns = bbs[base + PAWN]
+        if side == WHITE:
+            single = (pawns >> 8) & empty
+            double = ((single & ROW_3) >> 8) & empty
+            left = ((pawns & NOT_A) >> 9) & rival
+            right = ((pawns & NOT_H) >> 7) & rival
+            push, left_from, right_from = 8, 9, 7
+        else:
+            single = (pawns << 8) & empty
+            double = ((single & ROW_6) << 8) & empty
+            left = ((pawns & NOT_A) << 7) & rival & FULL
+            right = ((pawns & NOT_H) << 9) & rival & FULL
+            push, left_from, right_from = -8, -7, -9
+
+        for to in _bits(single):
+            add(to + push | to << 6 | (PROMOTION if to < 8 or to > 55 else NORMAL) << 12)
+        for to in _bits(double):
+            add(to + 2 * push | to << 6 | DOUBLE_PUSH << 12)
+        for targets, diff in ((left, left_from), (right, right_from)):
+            for to in _bits(targets):
+                add(to + diff | to << 6 | (PROMOTION if to < 8 or to > 55 else NORMAL) << 12)
+
+        if self.en_passant >= 0:
+            ep_bit = 1 << self.en_passant
+            if side == WHITE:
+                attackers = ((ep_bit & NOT_A) << 7 | (ep_bit & NOT_H) << 9) & pawns
+            else:
+                attackers = ((ep_bit & NOT_A) >> 9 | (ep_bit & NOT_H) >> 7) & pawns
+            for frm in _bits(attackers):
+                add(frm | self.en_passant << 6 | EN_PASSANT << 12)
+
+        #кони и король - по таблицам
+        for frm in _bits(bbs[base + KNIGHT]):
+            for to in _bits(KNIGHT_ATTACKS[frm] & ~own):
+                add(frm | to << 6)
+        king_sqr = bbs[base + KING].bit_length() - 1
+        for to in _bits(KING_ATTACKS[king_sqr] & ~own):
+            add(king_sqr | to << 6)
+
+        #дальнобойные фигуры
+        queens = bbs[base + QUEEN]
+        for frm in _bits(bbs[base + ROOK] | queens):
+            for to in _bits(rook_attacks(frm, occ) & ~own):
+                add(frm | to << 6)
+        for frm in _bits(bbs[base + BISHOP] | queens):
+            for to in _bits(bishop_attacks(frm, occ) & ~own):
+                add(frm | to << 6)
+
+        #рокировка
+        rival_side = side ^ 1
+        if side == WHITE:
+            if self.castling & WHITE_OO and not occ & (3 << 61):
+                if not self.attacked(60, rival_side) and not self.attacked(61, rival_side) and not self.attacked(62, rival_side):
+                    add(60 | 62 << 6 | CASTLE << 12)
+            if self.castling & WHITE_OOO and not occ & (7 << 57):
+                if not self.attacked(60, rival_side) and not self.attacked(59, rival_side) and not self.attacked(58, rival_side):
+                    add(60 | 58 << 6 | CASTLE << 12)
+        else:
+            if self.castling & BLACK_OO and not occ & (3 << 5):
+                if not self.attacked(4, rival_side) and not self.attacked(5, rival_side) and not self.attacked(6, rival_side):
+                    add(4 | 6 << 6 | CASTLE << 12)
+            if self.castling & BLACK_OOO and not occ & (7 << 1):
+                if not self.attacked(4, rival_side) and not self.attacked(3, rival_side) and not self.attacked(2, rival_side):
+                    add(4 | 2 << 6 | CASTLE << 12)
+
+        return moves
+
+    def legal_moves(self, color=None):
+        '''Все легальные ходы стороны которая ходит (коды ходов)'''
+        if color is not None and color != self.next_player:
+            raise ValueError(f'{color} is not to move')
+
+        side = WHITE if self.next_player == 'white' else BLACK
+        king_sqr = self.bbs[side * 6 + KING].bit_length() - 1
+        check = self.attacked(king_sqr, side ^ 1)
+        line = LINES[king_sqr]
+
+        legal = []
+        for move in self.pseudo_moves():
+            frm = move & 63
+            #ход не королем, не с линии короля и без шаха легален сразу
+            if not check and frm != king_sqr and not line & (1 << frm) and move >> 12 != EN_PASSANT:
+                legal.append(move)
+                continue
+            self.make_move(move)
+            if not self.attacked(self.bbs[side * 6 + KING].bit_length() - 1, side ^ 1):
+                legal.append(move)
+            self.unmake_move()
+
+        return legal
+
+    def make_move(self, move):
+        frm = move & 63
+        to = (move >> 6) & 63
+        flag = move >> 12
+        side = WHITE if self.next_player == 'white' else BLACK
+        bbs = self.bbs
+        occ = self.occ
+        mailbox = self.mailbox
+
+        index = mailbox[frm]
+        captured = mailbox[to]
+        self._history.append((move, captured, self.castling, self.en_passant))
+
+        frm_bit = 1 << frm
+        to_bit = 1 << to
+
+        if captured >= 0:
+            bbs[captured] ^= to_bit
+            occ[side ^ 1] ^= to_bit
+
+        bbs[index] ^= frm_bit | to_bit
+        occ[side] ^= frm_bit | to_bit
+        mailbox[frm] = -1
+        mailbox[to] = index
+
+        if flag == EN_PASSANT:
+            cap_sqr = to + 8 if side == WHITE else to - 8
+            bbs[(side ^ 1) * 6 + PAWN] ^= 1 << cap_sqr
+            occ[side ^ 1] ^= 1 << cap_sqr
+            mailbox[cap_sqr] = -1
+        elif flag == PROMOTION:
+            queen = side * 6 + QUEEN
+            bbs[index] ^= to_bit
+            bbs[queen] |= to_bit
+            mailbox[to] = queen
+        elif flag == CASTLE:
+            rook_frm, rook_to = (to + 1, to - 1) if to > frm else (to - 2, to + 1)
+            rook = side * 6 + ROOK
+            bbs[rook] ^= 1 << rook_frm | 1 << rook_to
+            occ[side] ^= 1 << rook_frm | 1 << rook_to
+            mailbox[rook_frm] = -1
+            mailbox[rook_to] = rook
+
+        self.castling &= CASTLE_MASK[frm] & CASTLE_MASK[to]
+        self.en_passant = (frm + to) // 2 if flag == DOUBLE_PUSH else -1
+        self.next_player = 'black' if side == WHITE else 'white'
+
+    def unmake_move(self):
+        move, captured, castling, en_passant = self._history.pop()
+        frm = move & 63
+        to = (move >> 6) & 63
+        flag = move >> 12
+        self.next_player = 'black' if self.next_player == 'white' else 'white'
+        side = WHITE if self.next_player == 'white' else BLACK
+        bbs = self.bbs
+        occ = self.occ
+        mailbox = self.mailbox
+
+        frm_bit = 1 << frm
+        to_bit = 1 << to
+
+        if flag == PROMOTION:
+            bbs[side * 6 + QUEEN] ^= to_bit
+            index = side * 6 + PAWN
+            bbs[index] |= to_bit
+        else:
+            index = mailbox[to]
+
+        bbs[index] ^= frm_bit | to_bit
+        occ[side] ^= frm_bit | to_bit
+        mailbox[frm] = index
+        mailbox[to] = captured
+
+        if captured >= 0:
+            bbs[captured] |= to_bit
+            occ[side ^ 1] |= to_bit
+
+        if flag == EN_PASSANT:
+            cap_sqr = to + 8 if side == WHITE else to - 8
+            pawn = (side ^ 1) * 6 + PAWN
+            bbs[pawn] |= 1 << cap_sqr
+            occ[side ^ 1] |= 1 << cap_sqr
+            mailbox[cap_sqr] = pawn
+        elif flag == CASTLE:
+            rook_frm, rook_to = (to + 1, to - 1) if to > frm else (to - 2, to + 1)
+            rook = side * 6 + ROOK
+            bbs[rook] ^= 1 << rook_frm | 1 << rook_to
+            occ[side] ^= 1 << rook_frm | 1 << rook_to
+            mailbox[rook_to] = -1
+            mailbox[rook_frm] = rook
+
+        self.castling = castling
+        self.en_passant = en_passant
+
+    def perft(self, depth):
+        '''Число позиций на глубине depth'''
+        if depth == 0:
+            return 1
+
+        moves = self.legal_moves()
+        if depth == 1:
+            return len(moves)
+
+        nodes = 0
+        for move in moves:
+            self.make_move(move)
+            nodes += self.perft(depth - 1)
+            self.unmake_move()
+        return nodes
+
+    @staticmethod
+    def to_move(code):
+        '''Переводит код хода в Move для Board.valid_move / Board.move'''
+        #младшие 12 бит совпадают с Move.code
+        return Move.from_code(code)
+
+    def from_move(self, move):
+        '''Находит код хода по Move с доски Board'''
+        for code in self.legal_moves():
+            if code & 4095 == move.code:
+                return code
+        return None
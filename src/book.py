@@ -0,0 +1,95 @@
+import mmap
+import random
+import struct
+
+from core import Move, King
+
+
+#запись Polyglot: ключ (8 байт), ход (2), вес (2), learn (4), big-endian, записи отсортированы по ключу
+ENTRY = struct.Struct('>QHHI')
+KEY = struct.Struct('>Q')
+
+
+class OpeningBook:
+    '''Книга дебютов в формате Polyglot (.bin), читается через mmap без загрузки в память'''
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.size = 0
+        self._data = None
+        #mmap не умеет отображать пустой файл
+        if self._file.seek(0, 2) >= ENTRY.size:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.size = len(self._data) // ENTRY.size
+
+    #в другой процесс передается только путь: страницы файла общие через кэш ОС, без копирования
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def _lower_bound(self, key):
+        #первая запись с ключом >= key (двоичный поиск по отсортированному файлу)
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(self._data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entries(self, board):
+        '''Ходы книги для позиции: список (Move, вес)'''
+        if self._data is None:
+            return []
+        key = board.hash
+        entries = []
+        index = self._lower_bound(key)
+        while index < self.size:
+            entry_key, move, weight, learn = ENTRY.unpack_from(self._data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            entries.append((self.to_move(board, move), weight))
+            index += 1
+        return entries
+
+    def choose(self, board, rng=random):
+        '''Случайный ход книги с учетом весов (только легальные), None если позиции нет в книге'''
+        legal = board.legal_moves(board.next_player)
+        moves, weights = [], []
+        for move, weight in self.entries(board):
+            if weight and move in legal:
+                moves.append(move)
+                weights.append(weight)
+        if not moves:
+            return None
+        return rng.choices(moves, weights)[0]
+
+    @staticmethod
+    def to_move(board, code):
+        '''Ход Polyglot (вертикаль/горизонталь поля куда | откуда) в Move доски'''
+        col, row = code & 7, 7 - (code >> 3 & 7)
+        from_col, from_row = code >> 6 & 7, 7 - (code >> 9 & 7)
+
+        #рокировка записана как "король берет свою ладью": e1h1 -> e1g1, e1a1 -> e1c1
+        piece = board.squares[from_row][from_col].piece
+        if isinstance(piece, King) and from_col == 4 and row == from_row and col in (0, 7):
+            col = 6 if col == 7 else 2
+
+        #фигуру превращения (биты 12-14) не учитываем: на доске пешка всегда становится ферзем
+        return Move.get(from_row, from_col, row, col)
@@ -1,8 +1,20 @@
+from core.const import *
+
 #Размеры экрана
 WIDTH = 800
 HEIGHT = 800
 
-#Размеры доски
-ROWS = 8
-COLS = 8
-SQSIZE = WIDTH // COLS
\ No newline at end of file
+#Размер клетки
+SQSIZE = WIDTH // COLS
+
+#ограничение частоты кадров
+FPS = 60
+
+#книга дебютов Polyglot (необязательна)
+BOOK_PATH = 'assets/books/book.bin'
+
+#таблицы эндшпиля (строятся командой python src/tablebase.py)
+TABLEBASE_PATH = 'assets/tablebases'
+
+#каталог для сохраненных партий PGN
+GAMES_PATH = 'games'
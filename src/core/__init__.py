@@ -0,0 +1,8 @@
+#правила игры без pygame и работы с файлами: их можно импортировать
+#из движка, perft и пакетных задач без окна и звука
+from .board import Board
+from .move import Move
+from .square import Square
+from .piece import Piece, Pawn, Knight, Bishop, Rook, Queen, King
+from .fen import load_fen, to_fen, START_FEN
+from .san import to_san, parse_san, IllegalMoveError
@@ -0,0 +1,142 @@
+from .const import *
+from .piece import *
+
+
+def _targets(incrs):
+    #поля на которые фигура бьет с каждого поля (индекс row * 8 + col)
+    table = []
+    for sqr in range(ROWS * COLS):
+        row, col = divmod(sqr, COLS)
+        table.append(tuple(
+            (row + row_incr) * COLS + col + col_incr
+            for row_incr, col_incr in incrs
+            if 0 <= row + row_incr < ROWS and 0 <= col + col_incr < COLS
+        ))
+    return table
+
+
+def _rays(row_incr, col_incr):
+    table = []
+    for sqr in range(ROWS * COLS):
+        row, col = divmod(sqr, COLS)
+        ray = []
+        r, c = row + row_incr, col + col_incr
+        while 0 <= r < ROWS and 0 <= c < COLS:
+            ray.append(r * COLS + c)
+            r, c = r + row_incr, c + col_incr
+        table.append(tuple(ray))
+    return table
+
+
+KNIGHT_TARGETS = _targets(KNIGHT_INCRS)
+KING_TARGETS = _targets(KING_INCRS)
+PAWN_TARGETS = {'white': _targets(((-1, -1), (-1, 1))), 'black': _targets(((1, -1), (1, 1)))}
+
+#лучи с каждого поля: сначала 4 прямых, потом 4 диагональных
+DIRECTIONS = ROOK_INCRS + BISHOP_INCRS
+_DIRECTION_RAYS = [_rays(row_incr, col_incr) for row_incr, col_incr in DIRECTIONS]
+RAYS = [tuple(rays[sqr] for rays in _DIRECTION_RAYS) for sqr in range(ROWS * COLS)]
+OPPOSITE = [DIRECTIONS.index((-row_incr, -col_incr)) for row_incr, col_incr in DIRECTIONS]
+ROOK_RAYS = [rays[:4] for rays in RAYS]
+BISHOP_RAYS = [rays[4:] for rays in RAYS]
+
+
+def piece_attacks(squares, piece, sqr):
+    '''Поля которые бьет фигура с поля sqr; дальнобойные - до первой фигуры включительно'''
+    if isinstance(piece, Pawn):
+        return PAWN_TARGETS[piece.color][sqr]
+    if isinstance(piece, Knight):
+        return KNIGHT_TARGETS[sqr]
+    if isinstance(piece, King):
+        return KING_TARGETS[sqr]
+
+    if isinstance(piece, Rook):
+        rays = ROOK_RAYS[sqr]
+    elif isinstance(piece, Bishop):
+        rays = BISHOP_RAYS[sqr]
+    else:
+        rays = RAYS[sqr]
+    targets = []
+    for ray in rays:
+        for target in ray:
+            targets.append(target)
+            if squares[target >> 3][target & 7].piece is not None:
+                break
+    return targets
+
+
+class Attacks:
+    '''Поля которые бьет соперник, шахи и связки короля цвета color'''
+
+    def __init__(self, board, color):
+        self.color = color
+        rival = 'black' if color == 'white' else 'white'
+        #сколько фигур соперника бьет каждое поле (индекс row * 8 + col)
+        self.attacked = [0] * (ROWS * COLS)
+        #поля фигур которые объявили шах
+        self.checkers = []
+        #поля на которые можно сходить чтобы закрыться от шаха (или съесть шахующую фигуру)
+        self.check_mask = None
+        #связанные фигуры: поле фигуры -> поля по которым она может ходить
+        self.pins = {}
+
+        self._calc_attacks(board, rival)
+        self._calc_checks(board, rival)
+
+    def in_check(self):
+        return len(self.checkers) > 0
+
+    def _calc_attacks(self, board, rival):
+        squares = board.squares
+        attacked = self.attacked
+        for sqr in range(ROWS * COLS):
+            piece = squares[sqr >> 3][sqr & 7].piece
+            if piece is not None and piece.color == rival:
+                for target in piece_attacks(squares, piece, sqr):
+                    attacked[target] += 1
+
+    def _calc_checks(self, board, rival):
+        #все считается от короля: пешки и кони рядом, дальнобойные фигуры по 8 лучам
+        squares = board.squares
+        color = self.color
+        king_row, king_col = board.king_squares[color]
+        king_sqr = king_row * COLS + king_col
+
+        for sqr in PAWN_TARGETS[color][king_sqr]:
+            piece = squares[sqr >> 3][sqr & 7].piece
+            if isinstance(piece, Pawn) and piece.color == rival:
+                self.checkers.append(sqr)
+                self.check_mask = {sqr}
+        for sqr in KNIGHT_TARGETS[king_sqr]:
+            piece = squares[sqr >> 3][sqr & 7].piece
+            if isinstance(piece, Knight) and piece.color == rival:
+                self.checkers.append(sqr)
+                self.check_mask = {sqr}
+
+        for index, ray in enumerate(RAYS[king_sqr]):
+            slider = Rook if index < 4 else Bishop
+            pinned = None
+            for position, sqr in enumerate(ray):
+                piece = squares[sqr >> 3][sqr & 7].piece
+                if piece is None:
+                    continue
+                if piece.color == color:
+                    #вторая своя фигура на луче - связки нет
+                    if pinned is not None:
+                        break
+                    pinned = sqr
+                    continue
+                if isinstance(piece, (slider, Queen)):
+                    if pinned is not None:
+                        self.pins[pinned] = set(ray[:position + 1])
+                    else:
+                        self.checkers.append(sqr)
+                        self.check_mask = set(ray[:position + 1])
+                        self._xray(king_sqr, index)
+                break
+
+    def _xray(self, king_sqr, index):
+        #король прозрачен для шахующей фигуры: отступить по линии шаха нельзя
+        behind = RAYS[king_sqr][OPPOSITE[index]]
+        if behind:
+            self.attacked[behind[0]] += 1
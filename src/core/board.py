@@ -0,0 +1,703 @@
+from .const import *
+from .piece import *
+from .attacks import Attacks
+from .zobrist import *
+from .evaluation import piece_scores, PHASES
+from .square import Square
+from .move import Move
+from .movecache import MoveCache
+
+
+class Board:
+
+    def __init__(self):
+        self.squares = [[0, 0, 0, 0, 0, 0, 0, 0] for col in range(COLS)]
+        self.next_player = 'white'
+        self.last_move = None
+        self.en_passant_pawn = None
+        self.king_squares = {'white': (7, 4), 'black': (0, 4)}
+        self._history = []
+        self._attacks = {}
+        #счетчики FEN (полуходы без взятий и ходов пешкой, номер хода) для начальной позиции доски
+        self.counters = (0, 1)
+        #легальные ходы для интерфейса по позициям (клики и подсказки)
+        self.move_cache = MoveCache()
+        self._create()
+        self._add_pieces('white')
+        self._add_pieces('black')
+        self.update_hash()
+        self.update_eval()
+
+    def move(self, piece, move):
+        '''Ход из интерфейса; возвращает съеденную фигуру (и на проходе) или None'''
+        #делаем ход (взятие, рокировка, превращение, флаги)
+        self.make_move(piece, move)
+
+        #очищаем список ходов
+        piece.clear_moves()
+        #позиция могла уже встречаться, но флаги пешек еще поменяет set_true_en_passant
+        self.move_cache.discard(self)
+
+        #звук взятия проигрывает интерфейс по возвращенной фигуре
+        return self._history[-1][2]
+
+    @staticmethod
+    def from_fen(fen):
+        '''Доска с позицией из FEN'''
+        from .fen import load_fen
+        return load_fen(fen)[0]
+
+    def fen(self):
+        from .fen import to_fen
+        return to_fen(self)
+
+    def make_move(self, piece, move):
+        '''Делает ход на месте и запоминает все изменения для unmake_move'''
+        initial = move.initial
+        final = move.final
+        initial_sqr = self.squares[initial.row][initial.col]
+        final_sqr = self.squares[final.row][final.col]
+
+        #съедаемая фигура и клетка на которой она стоит
+        captured = final_sqr.piece
+        captured_sqr = final_sqr
+
+        rook = None
+        rook_moved = False
+        promoted = False
+        hash = key = self.hash
+        en_passant_key = self._en_passant_key
+        next_player = self.next_player
+        score = mg, eg, phase = self.mg, self.eg, self.phase
+
+        if isinstance(piece, Pawn):
+            #взятие пешки на проходе
+            if captured is None and final.col != initial.col:
+                captured_sqr = self.squares[initial.row][final.col]
+                captured = captured_sqr.piece
+
+        #права на рокировку меняются только ходом короля или ладьи
+        castling_changed = isinstance(piece, (King, Rook)) or isinstance(captured, Rook)
+        if castling_changed:
+            key ^= CASTLING_KEYS[self.castling_rights()]
+
+        #убираем из ключа фигуру с начального поля и съеденную фигуру
+        key ^= piece_key(piece, initial.row, initial.col)
+        if captured is not None:
+            key ^= piece_key(captured, captured_sqr.row, captured_sqr.col)
+
+        #то же для оценки (суммы со стороны белых)
+        piece_mg, piece_eg = piece_scores(piece, initial.row, initial.col)
+        mg -= piece_mg
+        eg -= piece_eg
+        if captured is not None:
+            piece_mg, piece_eg = piece_scores(captured, captured_sqr.row, captured_sqr.col)
+            mg -= piece_mg
+            eg -= piece_eg
+            phase -= PHASES[type(captured)]
+            self.piece_count -= 1
+
+        #запоминаем состояние до хода
+        moved = piece.moved
+        en_passant_pawn = self.en_passant_pawn
+        last_move = self.last_move
+        attacks = self._attacks
+
+        #переставляем фигуру
+        captured_sqr.piece = None
+        initial_sqr.piece = None
+        final_sqr.piece = piece
+
+        if isinstance(piece, Pawn):
+            #превращение пешки
+            if final.row == 0 or final.row == 7:
+                self.check_promotion(piece, final)
+                promoted = True
+
+        #королевская рокировка
+        elif isinstance(piece, King):
+            self.king_squares[piece.color] = (final.row, final.col)
+            if self.castling(initial, final):
+                rook_col, rook_final_col = (0, 3) if final.col < initial.col else (7, 5)
+                rook = self.squares[initial.row][rook_col].piece
+                rook_moved = rook.moved
+                self.squares[initial.row][rook_col].piece = None
+                self.squares[initial.row][rook_final_col].piece = rook
+                rook.moved = True
+                key ^= piece_key(rook, initial.row, rook_col) ^ piece_key(rook, initial.row, rook_final_col)
+                rook_mg, rook_eg = piece_scores(rook, initial.row, rook_col)
+                piece_mg, piece_eg = piece_scores(rook, initial.row, rook_final_col)
+                mg += piece_mg - rook_mg
+                eg += piece_eg - rook_eg
+
+        #фигура на конечном поле (ферзь если пешка превратилась)
+        key ^= piece_key(final_sqr.piece, final.row, final.col)
+        piece_mg, piece_eg = piece_scores(final_sqr.piece, final.row, final.col)
+        self.mg = mg + piece_mg
+        self.eg = eg + piece_eg
+        if promoted:
+            self.phase = phase + PHASES[Queen]
+        else:
+            self.phase = phase
+
+        #очередь хода переходит сопернику
+        self.next_player = 'black' if piece.color == 'white' else 'white'
+        key ^= TURN_KEY
+
+        #пешка сходившая на 2 клетки может быть взята на проходе
+        if self.en_passant_pawn is not None:
+            self.en_passant_pawn.en_passant = False
+            self.en_passant_pawn = None
+        key ^= en_passant_key
+        self._en_passant_key = 0
+        if isinstance(piece, Pawn) and abs(final.row - initial.row) == 2:
+            piece.en_passant = True
+            self.en_passant_pawn = piece
+            self._en_passant_key = self.en_passant_key(final.row, final.col)
+            key ^= self._en_passant_key
+
+        #меняем статус фигуры
+        piece.moved = True
+        if castling_changed:
+            key ^= CASTLING_KEYS[self.castling_rights()]
+        self.hash = key
+
+        #указываем последний ход
+        self.last_move = move
+
+        #карты атак старой позиции больше не действительны; новые строятся при первом запросе.
+        #обновлять их ходом невыгодно: в листьях поиска ход делается только ради оценки,
+        #а пересчет атак вокруг изменившихся полей стоит столько же, сколько подсчет с нуля
+        self._attacks = {}
+
+        self._history.append((
+            piece, move, captured, captured_sqr, moved, en_passant_pawn, last_move,
+            attacks, rook, rook_moved, promoted, hash, en_passant_key, next_player, score,
+        ))
+
+    def unmake_move(self):
+        '''Отменяет последний ход сделанный через make_move'''
+        (piece, move, captured, captured_sqr, moved, en_passant_pawn, last_move,
+         attacks, rook, rook_moved, promoted, hash, en_passant_key, next_player, score) = self._history.pop()
+        initial = move.initial
+        final = move.final
+
+        #возвращаем фигуры на место
+        self.squares[final.row][final.col].piece = None
+        captured_sqr.piece = captured
+        self.squares[initial.row][initial.col].piece = piece
+
+        #возвращаем ладью после рокировки
+        if isinstance(piece, King):
+            self.king_squares[piece.color] = (initial.row, initial.col)
+            if rook is not None:
+                rook_col, rook_final_col = (0, 3) if final.col < initial.col else (7, 5)
+                self.squares[initial.row][rook_final_col].piece = None
+                self.squares[initial.row][rook_col].piece = rook
+                rook.moved = rook_moved
+
+        #восстанавливаем флаг взятия на проходе
+        if self.en_passant_pawn is not None:
+            self.en_passant_pawn.en_passant = False
+        if en_passant_pawn is not None:
+            en_passant_pawn.en_passant = True
+        self.en_passant_pawn = en_passant_pawn
+
+        piece.moved = moved
+        self.last_move = last_move
+        self._attacks = attacks
+        self.hash = hash
+        self._en_passant_key = en_passant_key
+        self.next_player = next_player
+        self.mg, self.eg, self.phase = score
+        if captured is not None:
+            self.piece_count += 1
+
+    def repetitions(self):
+        '''Сколько раз текущая позиция уже была (до последнего хода пешкой или взятия)'''
+        count = 0
+        for record in reversed(self._history):
+            if record[11] == self.hash:
+                count += 1
+            if isinstance(record[0], Pawn) or record[2] is not None:
+                break
+        return count
+
+    def castling_rights(self):
+        '''Права на рокировку (биты WHITE_OO...) по флагам moved короля и ладей'''
+        rights = 0
+        for color, row, short, long in (('white', 7, WHITE_OO, WHITE_OOO), ('black', 0, BLACK_OO, BLACK_OOO)):
+            king = self.squares[row][4].piece
+            if not isinstance(king, King) or king.color != color or king.moved:
+                continue
+            for col, right in ((7, short), (0, long)):
+                rook = self.squares[row][col].piece
+                if isinstance(rook, Rook) and rook.color == color and not rook.moved:
+                    rights |= right
+        return rights
+
+    def en_passant_key(self, row, col):
+        '''Ключ взятия на проходе пешки (row, col) - только если рядом есть пешка соперника'''
+        for c in (col-1, col+1):
+            if 0 <= c < COLS:
+                p = self.squares[row][c].piece
+                if isinstance(p, Pawn) and p.color == self.next_player:
+                    return EN_PASSANT_KEYS[col]
+        return 0
+
+    def update_hash(self):
+        '''Пересчитывает ключ Zobrist позиции с нуля'''
+        key = 0
+        self._en_passant_key = 0
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = self.squares[row][col].piece
+                if piece is not None:
+                    key ^= piece_key(piece, row, col)
+                    if piece is self.en_passant_pawn:
+                        self._en_passant_key = self.en_passant_key(row, col)
+
+        key ^= CASTLING_KEYS[self.castling_rights()]
+        key ^= self._en_passant_key
+        if self.next_player == 'white':
+            key ^= TURN_KEY
+        self.hash = key
+
+    def update_eval(self):
+        '''Пересчитывает суммы оценки (материал и поля, стадию игры) с нуля'''
+        self.mg = self.eg = self.phase = 0
+        #число фигур на доске (для таблиц эндшпиля)
+        self.piece_count = 0
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = self.squares[row][col].piece
+                if piece is not None:
+                    self.piece_count += 1
+                    piece_mg, piece_eg = piece_scores(piece, row, col)
+                    self.mg += piece_mg
+                    self.eg += piece_eg
+                    self.phase += PHASES[type(piece)]
+
+    #логика метода сравнения указа в методах __eq__ (Square, Move)
+    def valid_move(self, piece, move):
+        return move in piece.moves
+
+    def check_promotion(self, piece, final):
+        if final.row == 0 or final.row == 7:
+            self.squares[final.row][final.col].piece = Queen(piece.color)
+
+    def castling(self, initial, final):
+        return abs(initial.col - final.col) == 2
+
+    def set_true_en_passant(self, piece):
+        
+        if not isinstance(piece, Pawn):
+            return
+
+        #ходы считались со старыми флагами взятия на проходе
+        self.move_cache.discard(self)
+        
+        for row in range(ROWS):
+            for col in range(COLS):
+                if isinstance(self.squares[row][col].piece, Pawn):
+                    self.squares[row][col].piece.en_passant = False
+
+        self.en_passant_pawn = None
+
+        #взять на проходе можно только пешку сходившую на 2 клетки
+        last_move = self.last_move
+        if last_move and abs(last_move.final.row - last_move.initial.row) == 2:
+            piece.en_passant = True
+            self.en_passant_pawn = piece
+
+        self.update_hash()
+        self.move_cache.discard(self)
+
+    def attacks(self, color):
+        '''Карта атак соперника и связки короля цвета color для текущей позиции'''
+        attacks = self._attacks.get(color)
+        if attacks is None:
+            attacks = self._attacks[color] = Attacks(self, color)
+        return attacks
+
+    def legal(self, piece, move):
+        '''Проверяет не оставляет ли ход своего короля под шахом'''
+        initial = move.initial
+        final = move.final
+        attacks = self.attacks(piece.color)
+        final_sqr = final.row * COLS + final.col
+
+        if isinstance(piece, King):
+            #рокировка: король не под шахом и не проходит через битые поля
+            if self.castling(initial, final):
+                if attacks.in_check():
+                    return False
+                step = 1 if final.col > initial.col else -1
+                for c in range(initial.col + step, final.col + step, step):
+                    if attacks.attacked[final.row * COLS + c]:
+                        return False
+                return True
+            return not attacks.attacked[final_sqr]
+
+        #взятие на проходе может вскрыть линию по горизонтали, проверяем ходом
+        if isinstance(piece, Pawn) and final.col != initial.col and self.squares[final.row][final.col].isempty():
+            return not self.in_check(piece, move)
+
+        #от двойного шаха спасает только ход короля
+        if len(attacks.checkers) > 1:
+            return False
+        if attacks.check_mask is not None and final_sqr not in attacks.check_mask:
+            return False
+
+        pin = attacks.pins.get(initial.row * COLS + initial.col)
+        return pin is None or final_sqr in pin
+
+    def in_check(self, piece, move):
+        #делаем ход на месте без копирования доски
+        self.make_move(piece, move)
+
+        row, col = self.king_squares[piece.color]
+        check = self.under_attack(row, col, piece.color)
+
+        self.unmake_move()
+
+        return check
+
+    def under_attack(self, row, col, color):
+        '''Проверяет бьет ли соперник цвета color клетку (row, col)'''
+        squares = self.squares
+
+        #пешки
+        pawn_row = row + (-1 if color == 'white' else 1)
+        if 0 <= pawn_row < ROWS:
+            for pawn_col in (col-1, col+1):
+                if 0 <= pawn_col < COLS:
+                    p = squares[pawn_row][pawn_col].piece
+                    if isinstance(p, Pawn) and p.color != color:
+                        return True
+
+        #кони
+        for row_incr, col_incr in KNIGHT_INCRS:
+            r, c = row + row_incr, col + col_incr
+            if 0 <= r < ROWS and 0 <= c < COLS:
+                p = squares[r][c].piece
+                if isinstance(p, Knight) and p.color != color:
+                    return True
+
+        #король
+        for row_incr, col_incr in KING_INCRS:
+            r, c = row + row_incr, col + col_incr
+            if 0 <= r < ROWS and 0 <= c < COLS:
+                p = squares[r][c].piece
+                if isinstance(p, King) and p.color != color:
+                    return True
+
+        #дальнобойные фигуры (первая фигура на каждом луче)
+        for incrs, sliders in ((ROOK_INCRS, (Rook, Queen)), (BISHOP_INCRS, (Bishop, Queen))):
+            for row_incr, col_incr in incrs:
+                r, c = row + row_incr, col + col_incr
+                while 0 <= r < ROWS and 0 <= c < COLS:
+                    p = squares[r][c].piece
+                    if p is not None:
+                        if isinstance(p, sliders) and p.color != color:
+                            return True
+                        break
+                    r, c = r + row_incr, c + col_incr
+
+        return False
+
+    def cached_moves(self, row, col):
+        '''Легальные ходы фигуры на (row, col) из кэша позиции; только для стороны которая ходит'''
+        return self.move_cache.moves(self).get((row, col), [])
+
+    def calc_moves(self, piece, row, col, bool=True):
+        '''Расчитывает все возможные ходы выбранной фигуры в ее позиции'''
+        for move in self.piece_moves(piece, row, col, bool):
+            piece.add_move(move)
+
+    def legal_moves(self, color):
+        '''Все легальные ходы стороны color одним списком, списки ходов фигур не меняются'''
+        moves = []
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = self.squares[row][col].piece
+                if piece is not None and piece.color == color:
+                    moves.extend(self.piece_moves(piece, row, col))
+        return moves
+
+    def capture_moves(self, color):
+        '''Легальные взятия (и на проходе) и превращения стороны color - ходы форсированного поиска'''
+        squares = self.squares
+        moves = []
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = squares[row][col].piece
+                if piece is None or piece.color != color:
+                    continue
+                pawn = isinstance(piece, Pawn)
+                #легальность проверяем только у взятий: тихих ходов намного больше
+                for move in self.piece_moves(piece, row, col, bool=False):
+                    final = move.final
+                    if squares[final.row][final.col].piece is not None or pawn and (final.col != col or final.row in (0, 7)):
+                        if self.legal(piece, move):
+                            moves.append(move)
+        return moves
+
+    def king_in_check(self, color):
+        return self.attacks(color).in_check()
+
+    def piece_moves(self, piece, row, col, bool=True):
+        '''Генерирует ходы фигуры в ее позиции (bool - только легальные)'''
+        #ходы берутся из общей таблицы Move.get, новые объекты не создаются
+
+        def pawn_moves():
+            #проверка на количество ходов у пешки
+            steps = 1 if piece.moved else 2
+
+            #вертикальные ходы
+            start = row + piece.dir
+            end = row + (piece.dir * (1 + steps))
+
+            for possible_move_row in range(start, end, piece.dir):
+                if Square.in_range(possible_move_row):
+                    if self.squares[possible_move_row][col].isempty():
+                        #выбираем поля для нового хода
+                        move = Move.get(row, col, possible_move_row, col)
+
+                        #проверяем не связана ли фигура с королем
+                        if not bool or self.legal(piece, move):
+                            yield move
+                    #завершаем цикл потому что клетка впереди не пуста
+                    else: break
+                #завершаем цикл потому что клетка вне окна
+                else: break
+
+            #диагональные ходы
+            possible_move_row = row + piece.dir
+            possible_move_cols = [col-1, col+1]
+            #проверяем на наличие пешки другого цвета если есть то ходить по диагонали можно
+            for possible_move_col in possible_move_cols:
+                if Square.in_range(possible_move_row, possible_move_col):
+                    if self.squares[possible_move_row][possible_move_col].has_rival_piece(piece.color):
+                        #указываем кординаты начала и конца хода
+                        move = Move.get(row, col, possible_move_row, possible_move_col)
+                        #проверяем не связана ли фигура с королем
+                        if not bool or self.legal(piece, move):
+                            yield move
+
+            #взятие пешки на проходе
+            r = 3 if piece.color == 'white' else 4
+            fr = 2 if piece.color == 'white' else 5
+            #проверка на левую часть
+            if Square.in_range(col-1) and row == r:
+                if self.squares[row][col-1].has_rival_piece(piece.color):
+                    p = self.squares[row][col-1].piece
+                    if isinstance(p, Pawn):
+                        if p.en_passant:
+                            #указываем кординаты начала и конца хода
+                            move = Move.get(row, col, fr, col-1)
+                            #проверяем не связана ли фигура с королем
+                            if not bool or self.legal(piece, move):
+                                yield move
+            
+            #проверка на правую часть
+            if Square.in_range(col+1) and row == r:
+                if self.squares[row][col+1].has_rival_piece(piece.color):
+                    p = self.squares[row][col+1].piece
+                    if isinstance(p, Pawn):
+                        if p.en_passant:
+                            #указываем кординаты начала и конца хода
+                            move = Move.get(row, col, fr, col+1)
+                            #проверяем не связана ли фигура с королем
+                            if not bool or self.legal(piece, move):
+                                yield move
+
+        def khight_moves():
+            #8 возможных ходов
+            possible_moves = [
+                (row-2, col+1),
+                (row-1, col +2),
+                (row+1, col +2),
+                (row+2, col+1),
+                (row+2, col-1),
+                (row+1, col-2),
+                (row-1, col-2),
+                (row-2, col-1),
+            ]
+
+            for possible_move in possible_moves:
+                possible_move_row, possible_move_col = possible_move
+                if Square.in_range(possible_move_row, possible_move_col):
+                    if self.squares[possible_move_row][possible_move_col].isempty_or_rival(piece.color):
+                        #выбираем поля для нового хода
+                        move = Move.get(row, col, possible_move_row, possible_move_col)
+                        #проверяем не связана ли фигура с королем
+                        if not bool or self.legal(piece, move):
+                            yield move
+
+        def king_moves():
+            adjs = [
+                (row-1, col+0), #вверх
+                (row-1, col+1), #вверх вправо
+                (row+0, col+1), #вправо
+                (row+1, col+1), #вниз вправо
+                (row+1, col+0), #вниз
+                (row+1, col-1), #вниз влево
+                (row+0, col-1), #влево
+                (row-1, col-1), #вверх влево
+            ]
+
+            for possible_move in adjs:
+                possible_move_row, possible_move_col = possible_move
+                
+                if Square.in_range(possible_move_row, possible_move_col):
+
+                    if self.squares[possible_move_row][possible_move_col].isempty_or_rival(piece.color):
+                        #выбираем поля для нового хода
+                        move = Move.get(row, col, possible_move_row, possible_move_col)
+                        #проверяем не связана ли фигура с королем
+                        if not bool or self.legal(piece, move):
+                            yield move
+            
+            #рокировка
+            if not piece.moved:
+
+                #рокировка в сторону ферзя
+                left_rook = self.squares[row][0].piece
+                if isinstance(left_rook, Rook):
+                    if not left_rook.moved:
+                        for c in range(1,4):
+                            #если между королем и ладьей есть фигуры то рокировка невозможна
+                            if self.squares[row][c].has_piece(): 
+                                break
+
+                            if c == 3:
+                                #перемещаем короля
+                                moveK = Move.get(row, col, row, 2)
+
+                                #проверяем не связана ли фигура с королем
+                                if not bool or self.legal(piece, moveK):
+                                    yield moveK
+                
+                #рокировка в сторону короля
+                right_rook = self.squares[row][7].piece
+                if isinstance(right_rook, Rook):
+                    if not right_rook.moved:
+                        for c in range(5, 7):
+                            #если между королем и ладьей есть фигуры то рокировка невозможна
+                            if self.squares[row][c].has_piece(): 
+                                break
+
+                            if c == 6:
+                                #перемещаем короля
+                                moveK = Move.get(row, col, row, 6)
+
+                                #проверяем не связана ли фигура с королем
+                                if not bool or self.legal(piece, moveK):
+                                    yield moveK
+
+        def straightline_moves(incrs):
+            for incr in incrs:
+                row_incr, col_incr = incr
+                possible_move_row = row + row_incr
+                possible_move_col = col + col_incr
+
+                while True:
+                    if Square.in_range(possible_move_row, possible_move_col):
+
+                        #выбираем поля для возможного нового хода
+                        move = Move.get(row, col, possible_move_row, possible_move_col)
+
+                        #если путь пустой мы не завершаем цикл
+                        if self.squares[possible_move_row][possible_move_col].isempty():
+                            #проверяем не связана ли фигура с королем
+                            if not bool or self.legal(piece, move):
+                                yield move
+
+                        #если на пути есть противник
+                        elif self.squares[possible_move_row][possible_move_col].has_rival_piece(piece.color):
+                            #проверяем не связана ли фигура с королем
+                            if not bool or self.legal(piece, move):
+                                yield move
+                            break
+
+                        #если на пути есть союзная фигура
+                        elif self.squares[possible_move_row][possible_move_col].has_team_piece(piece.color):
+                            break
+                    
+                    #за пределами доски
+                    else: break
+
+                    possible_move_row = possible_move_row + row_incr
+                    possible_move_col = possible_move_col + col_incr
+
+        if isinstance(piece, Pawn):
+            yield from pawn_moves()
+        
+        elif isinstance(piece, Knight):
+            yield from khight_moves()
+
+        elif isinstance(piece, Bishop):
+            yield from straightline_moves([
+                (-1, 1), #верхняя правая диагональ
+                (-1, -1), #верхняя левая диагональ
+                (1, 1), #нижняя правая диагональ
+                (1, -1) #нижняя левая диагональ
+            ])
+
+        elif isinstance(piece, Rook):
+            yield from straightline_moves([
+                (-1, 0), #вверх
+                (1, 0), #вниз
+                (0, 1), #вправо
+                (0, -1) #влево
+            ])
+
+        elif isinstance(piece, Queen):
+            yield from straightline_moves([
+                (-1, 1), #верхняя правая диагональ
+                (-1, -1), #верхняя левая диагональ
+                (1, 1), #нижняя правая диагональ
+                (1, -1), #нижняя левая диагональ
+                (-1, 0), #вверх
+                (1, 0), #вниз
+                (0, 1), #вправо
+                (0, -1) #влево
+            ])
+
+        elif isinstance(piece, King):
+            yield from king_moves()
+
+    def _create(self):
+        for row in range(ROWS):
+            for col in range(COLS):
+                self.squares[row][col] = Square(row, col)
+
+    def _add_pieces(self, color):
+        row_pawn, row_other = (6, 7) if color == 'white' else (1, 0)
+
+        #пешки
+        for col in range(COLS):
+            self.squares[row_pawn][col] = Square(row_pawn, col, Pawn(color))
+
+        #кони
+        self.squares[row_other][1] = Square(row_other, 1, Knight(color))
+        self.squares[row_other][6] = Square(row_other, 6, Knight(color))
+
+        #слоны
+        self.squares[row_other][2] = Square(row_other, 2, Bishop(color))
+        self.squares[row_other][5] = Square(row_other, 5, Bishop(color))
+
+        #ладьи
+        self.squares[row_other][0] = Square(row_other, 0, Rook(color))
+        self.squares[row_other][7] = Square(row_other, 7, Rook(color))
+
+        #ферзь
+        self.squares[row_other][3] = Square(row_other, 3, Queen(color))
+
+        #король (запоминает свои ладьи для рокировки)
+        king = King(color)
+        king.left_rook = self.squares[row_other][0].piece
+        king.right_rook = self.squares[row_other][7].piece
+        self.squares[row_other][4] = Square(row_other, 4, king)
+
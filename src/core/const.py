@@ -0,0 +1,12 @@
+#Размеры доски
+ROWS = 8
+COLS = 8
+
+#направления ходов фигур (строка, колонка)
+KNIGHT_INCRS = ((-2, 1), (-1, 2), (1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1))
+KING_INCRS = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+ROOK_INCRS = ((-1, 0), (1, 0), (0, 1), (0, -1))
+BISHOP_INCRS = ((-1, 1), (-1, -1), (1, 1), (1, -1))
+
+#права на рокировку (биты)
+WHITE_OO, WHITE_OOO, BLACK_OO, BLACK_OOO = 1, 2, 4, 8
@@ -0,0 +1,116 @@
+from .const import *
+from .piece import *
+from .board import Board
+from .square import Square
+
+
+PIECES = {'p': Pawn, 'n': Knight, 'b': Bishop, 'r': Rook, 'q': Queen, 'k': King}
+LETTERS = {kind: letter for letter, kind in PIECES.items()}
+
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+
+def load_fen(fen):
+    '''Создает доску по FEN, возвращает (board, цвет стороны которая ходит)'''
+    fields = fen.split()
+    placement = fields[0]
+    color = 'white' if len(fields) < 2 or fields[1] == 'w' else 'black'
+    castling = fields[2] if len(fields) > 2 else '-'
+    en_passant = fields[3] if len(fields) > 3 else '-'
+    halfmove = int(fields[4]) if len(fields) > 4 else 0
+    fullmove = int(fields[5]) if len(fields) > 5 else 1
+
+    board = Board()
+    board._create()
+
+    #расстановка фигур (первая строка FEN - восьмая горизонталь)
+    for row, line in enumerate(placement.split('/')):
+        col = 0
+        for char in line:
+            if char.isdigit():
+                col += int(char)
+                continue
+            piece_color = 'white' if char.isupper() else 'black'
+            piece = PIECES[char.lower()](piece_color)
+            #пешка не на своей начальной горизонтали уже ходила
+            if isinstance(piece, Pawn):
+                piece.moved = row != (6 if piece_color == 'white' else 1)
+            else:
+                piece.moved = True
+            if isinstance(piece, King):
+                board.king_squares[piece_color] = (row, col)
+            board.squares[row][col] = Square(row, col, piece)
+            col += 1
+
+    #права на рокировку через флаги moved короля и ладей
+    for piece_color, row, short, long in (('white', 7, 'K', 'Q'), ('black', 0, 'k', 'q')):
+        king = board.squares[row][4].piece
+        if not isinstance(king, King) or king.color != piece_color:
+            continue
+        for right, col, attr in ((short, 7, 'right_rook'), (long, 0, 'left_rook')):
+            rook = board.squares[row][col].piece
+            if right in castling and isinstance(rook, Rook) and rook.color == piece_color:
+                rook.moved = False
+                king.moved = False
+                setattr(king, attr, rook)
+
+    #пешка которую можно взять на проходе стоит перед полем из FEN
+    if en_passant != '-':
+        col = 'abcdefgh'.index(en_passant[0])
+        row = ROWS - int(en_passant[1])
+        row += 1 if color == 'white' else -1
+        pawn = board.squares[row][col].piece
+        if isinstance(pawn, Pawn):
+            pawn.en_passant = True
+            board.en_passant_pawn = pawn
+
+    board.next_player = color
+    board.counters = (halfmove, fullmove)
+    board.update_hash()
+    board.update_eval()
+
+    return board, color
+
+
+def to_fen(board):
+    '''FEN позиции на доске'''
+    lines = []
+    for row in range(ROWS):
+        line = ''
+        empty = 0
+        for col in range(COLS):
+            piece = board.squares[row][col].piece
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                line += str(empty)
+                empty = 0
+            letter = LETTERS[type(piece)]
+            line += letter.upper() if piece.color == 'white' else letter
+        if empty:
+            line += str(empty)
+        lines.append(line)
+
+    rights = board.castling_rights()
+    castling = ''.join(letter for bit, letter in ((WHITE_OO, 'K'), (WHITE_OOO, 'Q'), (BLACK_OO, 'k'), (BLACK_OOO, 'q')) if rights & bit)
+
+    #поле взятия на проходе - за пешкой которая только что сходила на 2 клетки
+    en_passant = '-'
+    pawn = board.en_passant_pawn
+    if pawn is not None:
+        for row in (3, 4):
+            for col in range(COLS):
+                if board.squares[row][col].piece is pawn:
+                    en_passant = f'{Square.get_alphacol(col)}{ROWS - (row - pawn.dir)}'
+
+    #счетчики: с загруженной позиции плюс ходы сделанные на доске
+    halfmove, fullmove = board.counters
+    for record in board._history:
+        piece, captured, next_player = record[0], record[2], record[13]
+        halfmove = 0 if isinstance(piece, Pawn) or captured is not None else halfmove + 1
+        if next_player == 'black':
+            fullmove += 1
+
+    side = 'w' if board.next_player == 'white' else 'b'
+    return f'{"/".join(lines)} {side} {castling or "-"} {en_passant} {halfmove} {fullmove}'
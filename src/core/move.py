@@ -0,0 +1,45 @@
+from .square import SQUARES
+
+
+class Move:
+
+    __slots__ = ('initial', 'final', 'code')
+
+    def __init__(self, initial, final):
+        #исоздный квадрат и куда хотим пойти
+        self.initial = initial
+        self.final = final
+        #код хода: from | to << 6, клетка = row * 8 + col
+        self.code = (initial.row * 8 + initial.col) | (final.row * 8 + final.col) << 6
+
+    def __eq__(self, other) -> bool:
+        return self.code == other.code
+
+    def __hash__(self):
+        return self.code
+
+    #ход не меняется, копии не нужны (доска копируется для поиска в потоке)
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __str__(self) -> str:
+        #запись хода в виде e2e4
+        initial = self.initial
+        final = self.final
+        return f'{initial.alphacol}{8 - initial.row}{final.alphacol}{8 - final.row}'
+
+    @staticmethod
+    def get(row, col, final_row, final_col):
+        '''Ход из общей таблицы: генератор ходов не создает новых объектов'''
+        return MOVES[(row * 8 + col) | (final_row * 8 + final_col) << 6]
+
+    @staticmethod
+    def from_code(code):
+        return MOVES[code & 4095]
+
+
+#все 64 * 64 пары клеток, индекс - код хода
+MOVES = tuple(Move(SQUARES[code & 63], SQUARES[code >> 6]) for code in range(4096))
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+
+
+class MoveCache:
+    '''Легальные ходы по позициям (ключ Zobrist и очередь хода), давно не нужные вытесняются (LRU)'''
+
+    def __init__(self, size=64):
+        self.size = size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    #у копии доски (поиск в потоке, другой процесс) свой пустой кэш
+    def __deepcopy__(self, memo):
+        return MoveCache(self.size)
+
+    def __getstate__(self):
+        return {'size': self.size}
+
+    def __setstate__(self, state):
+        self.__init__(state['size'])
+
+    def moves(self, board):
+        '''Ходы стороны которая ходит по полям фигур: {(row, col): [Move]}'''
+        key = (board.hash, board.next_player)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = {}
+        for move in board.legal_moves(board.next_player):
+            entry.setdefault((move.initial.row, move.initial.col), []).append(move)
+        self._entries[key] = entry
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, board):
+        '''Забывает ходы текущей позиции доски (ее флаги поменялись помимо ключа)'''
+        self._entries.pop((board.hash, board.next_player), None)
+
+    def clear(self):
+        self._entries.clear()
@@ -1,9 +1,9 @@
-import os
-
 
 class Piece:
 
-    def __init__(self, name, color, value, texture=None, texture_rect=None):
+    __slots__ = ('name', 'color', 'value', 'moves', 'moved', 'texture_size', 'texture_rect')
+
+    def __init__(self, name, color, value, texture_rect=None):
         self.name = name
         self.color = color
 
@@ -11,14 +11,16 @@ class Piece:
         self.value = value * value_sign
         self.moves = []
         self.moved = False
-        self.texture = texture
-        self.set_texture()
+        self.texture_size = 80
         self.texture_rect = texture_rect
 
+    @property
+    def texture(self):
+        #путь строится только когда нужен интерфейсу, картинку загружает он же
+        return f'assets/images/imgs-{self.texture_size}px/{self.color}_{self.name}.png'
+
     def set_texture(self, size=80):
-        self.texture = os.path.join(
-            f'assets/images/imgs-{size}px/{self.color}_{self.name}.png'
-        )
+        self.texture_size = size
 
     def add_move(self, move):
         self.moves.append(move)
@@ -29,6 +31,8 @@ class Piece:
 
 class Pawn(Piece):
 
+    __slots__ = ('dir', 'en_passant')
+
     def __init__(self, color):
         self.dir = -1 if color == 'white' else 1
         self.en_passant = False
@@ -37,30 +41,40 @@ class Pawn(Piece):
 
 class Knight(Piece):
 
+    __slots__ = ()
+
     def __init__(self, color):
         super().__init__('knight', color, 3.0)
 
 
 class Bishop(Piece):
 
+    __slots__ = ()
+
     def __init__(self, color):
         super().__init__('bishop', color, 3.001)
 
 
 class Rook(Piece):
 
+    __slots__ = ()
+
     def __init__(self, color):
         super().__init__('rook', color, 5.0)
 
 
 class Queen(Piece):
 
+    __slots__ = ()
+
     def __init__(self, color):
         super().__init__('queen', color, 9.0)
 
 
 class King(Piece):
 
+    __slots__ = ('left_rook', 'right_rook')
+
     def __init__(self, color):
         self.left_rook = None
         self.right_rook = None
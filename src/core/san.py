@@ -0,0 +1,109 @@
+import re
+
+from .const import *
+from .piece import *
+from .square import Square
+from .move import Move
+
+
+LETTERS = {Knight: 'N', Bishop: 'B', Rook: 'R', Queen: 'Q', King: 'K'}
+KINDS = {letter: kind for kind, letter in LETTERS.items()}
+
+SAN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?[+#]?[!?]*$')
+CASTLING = re.compile(r'^([O0]-[O0](-[O0])?)[+#]?[!?]*$')
+
+
+class IllegalMoveError(ValueError):
+    '''Ход в записи SAN невозможен в позиции (или неоднозначен)'''
+
+
+def _name(row, col):
+    return f'{Square.get_alphacol(col)}{ROWS - row}'
+
+
+def to_san(board, move):
+    '''Запись хода в SAN (Nf3, exd5, O-O, e8=Q+) для позиции на доске до хода'''
+    initial, final = move.initial, move.final
+    piece = board.squares[initial.row][initial.col].piece
+
+    if isinstance(piece, King) and board.castling(initial, final):
+        san = 'O-O' if final.col > initial.col else 'O-O-O'
+    else:
+        capture = board.squares[final.row][final.col].has_piece()
+        if isinstance(piece, Pawn):
+            capture = capture or final.col != initial.col
+            san = Square.get_alphacol(initial.col) if capture else ''
+            san += ('x' if capture else '') + _name(final.row, final.col)
+            if final.row in (0, ROWS - 1):
+                san += '=Q'
+        else:
+            #уточнение если на то же поле может пойти такая же фигура
+            others = [
+                other.initial for other in board.legal_moves(piece.color)
+                if other.final == final and other.initial != initial
+                and type(board.squares[other.initial.row][other.initial.col].piece) is type(piece)
+            ]
+            hint = ''
+            if others:
+                if all(other.col != initial.col for other in others):
+                    hint = Square.get_alphacol(initial.col)
+                elif all(other.row != initial.row for other in others):
+                    hint = str(ROWS - initial.row)
+                else:
+                    hint = _name(initial.row, initial.col)
+            san = LETTERS[type(piece)] + hint + ('x' if capture else '') + _name(final.row, final.col)
+
+    #шах или мат
+    board.make_move(piece, move)
+    rival = board.next_player
+    if board.king_in_check(rival):
+        san += '#' if not board.legal_moves(rival) else '+'
+    board.unmake_move()
+    return san
+
+
+def parse_san(board, san):
+    '''Находит (фигура, Move) по записи SAN; ход проверяется через Board.valid_move'''
+    color = board.next_player
+    match = CASTLING.match(san)
+    if match:
+        row = 7 if color == 'white' else 0
+        kind, from_col, from_row = King, 4, row
+        to_row, to_col = row, 2 if match.group(2) else 6
+        promotion = None
+    else:
+        match = SAN.match(san)
+        if not match:
+            raise IllegalMoveError(f'не запись SAN: {san}')
+        letter, file, rank, capture, target, promotion = match.groups()
+        kind = KINDS[letter] if letter else Pawn
+        from_col = 'abcdefgh'.index(file) if file else None
+        from_row = ROWS - int(rank) if rank else None
+        to_col, to_row = 'abcdefgh'.index(target[0]), ROWS - int(target[1])
+
+    #пешка превращается только в ферзя
+    if promotion and promotion != 'Q':
+        raise IllegalMoveError(f'превращение не в ферзя не поддерживается: {san}')
+
+    found = []
+    for row in range(ROWS):
+        if from_row is not None and row != from_row:
+            continue
+        for col in range(COLS):
+            if from_col is not None and col != from_col:
+                continue
+            piece = board.squares[row][col].piece
+            if type(piece) is not kind or piece.color != color:
+                continue
+            move = Move.get(row, col, to_row, to_col)
+            piece.clear_moves()
+            board.calc_moves(piece, row, col)
+            if board.valid_move(piece, move):
+                found.append((piece, move))
+            piece.clear_moves()
+
+    if not found:
+        raise IllegalMoveError(f'невозможный ход: {san}')
+    if len(found) > 1:
+        raise IllegalMoveError(f'неоднозначный ход: {san}')
+    return found[0]
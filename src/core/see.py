@@ -0,0 +1,101 @@
+from .const import *
+from .piece import *
+
+
+#лучи от поля размена: (шаг по строке, шаг по столбцу, прямая ли линия)
+RAYS = tuple((row_incr, col_incr, True) for row_incr, col_incr in ROOK_INCRS) + \
+    tuple((row_incr, col_incr, False) for row_incr, col_incr in BISHOP_INCRS)
+
+#пешка всегда превращается в ферзя
+QUEEN = abs(Queen('white').value)
+PROMOTION = QUEEN - abs(Pawn('white').value)
+
+
+def _attacks(piece, straight, distance, row, target_row):
+    #бьет ли фигура поле размена по лучу (фигуры перед ней на луче уже ушли на поле)
+    if isinstance(piece, Queen):
+        return True
+    if isinstance(piece, Rook):
+        return straight
+    if isinstance(piece, Bishop):
+        return not straight
+    if distance != 1:
+        return False
+    if isinstance(piece, King):
+        return True
+    return isinstance(piece, Pawn) and not straight and row + piece.dir == target_row
+
+
+def _least(rays, knights, color):
+    #самая дешевая фигура цвета color которая может взять на поле; убирается из очереди
+    best = best_list = None
+    for attackers in rays:
+        if attackers and attackers[-1].color == color and (best is None or abs(attackers[-1].value) < abs(best.value)):
+            best, best_list = attackers[-1], attackers
+    for knight in knights:
+        if knight.color == color and (best is None or abs(knight.value) < abs(best.value)):
+            best, best_list = knight, knights
+    if best is not None:
+        best_list.remove(best)
+    return best
+
+
+def see(board, move):
+    '''Итог размена на поле хода в единицах Piece.value без ходов на доске (< 0 - ход теряет материал)'''
+    squares = board.squares
+    initial, final = move.initial, move.final
+    row, col = final.row, final.col
+    piece = squares[initial.row][initial.col].piece
+    victim = squares[row][col].piece
+    removed = victim
+    if victim is None and isinstance(piece, Pawn) and initial.col != col:
+        #взятие на проходе: съеденная пешка стоит рядом, а не на поле хода
+        victim = removed = squares[initial.row][col].piece
+
+    #нападающие по каждому лучу от поля: ближняя фигура в конце списка, за ней рентген
+    rays = []
+    for row_incr, col_incr, straight in RAYS:
+        attackers = []
+        r, c, distance = row + row_incr, col + col_incr, 1
+        while 0 <= r < ROWS and 0 <= c < COLS:
+            p = squares[r][c].piece
+            if p is not None and p is not piece and p is not removed:
+                if not _attacks(p, straight, distance, r, row):
+                    break
+                attackers.append(p)
+            r, c, distance = r + row_incr, c + col_incr, distance + 1
+        if attackers:
+            attackers.reverse()
+            rays.append(attackers)
+
+    knights = []
+    for row_incr, col_incr in KNIGHT_INCRS:
+        r, c = row + row_incr, col + col_incr
+        if 0 <= r < ROWS and 0 <= c < COLS and isinstance(squares[r][c].piece, Knight) and squares[r][c].piece is not piece:
+            knights.append(squares[r][c].piece)
+
+    #gain[d] - выигрыш стороны сделавшей d-е взятие если дальше никто не бьет
+    gain = [abs(victim.value) if victim is not None else 0]
+    on_square = abs(piece.value)
+    if isinstance(piece, Pawn) and row in (0, ROWS - 1):
+        gain[0] += PROMOTION
+        on_square = QUEEN
+
+    color = 'black' if piece.color == 'white' else 'white'
+    while True:
+        attacker = _least(rays, knights, color)
+        if attacker is None:
+            break
+        value = abs(attacker.value)
+        bonus = 0
+        if isinstance(attacker, Pawn) and row in (0, ROWS - 1):
+            value, bonus = QUEEN, PROMOTION
+        gain.append(on_square + bonus - gain[-1])
+        on_square = value
+        color = 'black' if color == 'white' else 'white'
+
+    #каждая сторона может не продолжать размен, если он ей невыгоден
+    while len(gain) > 1:
+        last = gain.pop()
+        gain[-1] = -max(-gain[-1], last)
+    return gain[0]
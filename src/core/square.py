@@ -0,0 +1,58 @@
+
+class Square:
+
+    __slots__ = ('row', 'col', 'piece')
+
+    ALPHACOLS = {0:'a', 1:'b', 2:'c', 3:'d', 4:'e', 5:'f', 6:'g', 7:'h'}
+
+    def __init__(self, row, col, piece=None):
+        self.row = row
+        self.col = col
+        self.piece = piece
+
+    def __eq__(self, other) -> bool:
+        return self.row == other.row and self.col == other.col
+
+    def __hash__(self):
+        return self.row * 8 + self.col
+
+    @property
+    def alphacol(self):
+        return self.ALPHACOLS[self.col]
+
+    def has_piece(self):
+        return self.piece is not None
+
+    def isempty(self):
+        return self.piece is None
+
+    def has_team_piece(self, color):
+        return self.piece is not None and self.piece.color == color
+
+    def has_rival_piece(self, color):
+        return self.piece is not None and self.piece.color != color
+
+    def isempty_or_rival(self, color):
+        return self.piece is None or self.piece.color != color
+
+    @staticmethod
+    def get(row, col):
+        '''Общая пустая клетка для ходов (номер 0-63 = row * 8 + col), ее нельзя менять'''
+        return SQUARES[row * 8 + col]
+
+    @staticmethod
+    def in_range(*args):
+        for arg in args:
+            if arg < 0 or arg > 7:
+                return False
+        
+        return True
+
+    @staticmethod
+    def get_alphacol(col):
+        ALPHACOLS = {0:'a', 1:'b', 2:'c', 3:'d', 4:'e', 5:'f', 6:'g', 7:'h'}
+        return ALPHACOLS[col]
+
+
+#клетки без фигур для начала и конца ходов, создаются один раз
+SQUARES = tuple(Square(index // 8, index % 8) for index in range(64))
@@ -1,11 +1,10 @@
-import pygame
-
 from const import *
 
 
 class Dragger:
 
-    def __init__(self):
+    def __init__(self, textures):
+        self.textures = textures
         self.piece = None
         self.dragging = False
         self.mouseX = 0
@@ -16,17 +15,18 @@ class Dragger:
     #создаем видимость перетаскивания фигуры
 
     def update_blit(self, surface):
-        #при захвате фигуры меняем ее размер на 128 пикселей
-        self.piece.set_texture(size=128)
-        texture = self.piece.texture
-        #загрузка нового изображения
-        img = pygame.image.load(texture)
+        #при захвате фигуры меняем ее размер на 128 пикселей (картинка из кэша)
+        img = self.textures.get(self.piece, size=128)
         #захват картинки по центру нажатия мыши
-        img_center = (self.mouseX, self.mouseY)
-        self.piece.texture_rect = img.get_rect(center=img_center)
+        self.piece.texture_rect = self.rect()
         #blit
         surface.blit(img, self.piece.texture_rect)
 
+    def rect(self):
+        #место на экране где будет нарисована перетаскиваемая фигура
+        img = self.textures.get(self.piece, size=128)
+        return img.get_rect(center=(self.mouseX, self.mouseY))
+
     def update_mouse(self, pos):
         self.mouseX, self.mouseY = pos #(xcoord, ycoord)
 
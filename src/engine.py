@@ -0,0 +1,332 @@
+import time
+
+from core.evaluation import evaluate
+from core.move import Move
+from core.see import see
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+from ordering import MoveOrdering
+
+
+#оценки в сотых долях пешки
+MATE = 100000
+INFINITY = 1000000
+#оценки ближе к MATE чем MAX_PLY - это мат в N ходов
+MAX_PLY = 128
+
+
+def move_code(move):
+    '''Код хода для таблицы позиций: from | to << 6'''
+    return 0 if move is None else move.code
+
+
+class Engine:
+    '''Компьютерный соперник: негамакс с альфа-бета отсечением и итеративным углублением'''
+
+    def __init__(self, time_limit=1.0, depth=None, nodes=None, tt_size=16, book=None, tablebases=None, tt=None, quiescence=True):
+        #ограничения на ход: время в секундах, глубина, число позиций (None - без ограничения)
+        self.time_limit = time_limit
+        self.depth = depth
+        self.node_limit = nodes
+        #tt - готовая таблица (например общая для нескольких процессов)
+        self.tt = tt if tt is not None else TranspositionTable(tt_size)
+        #книга дебютов (OpeningBook): ход из нее делается без поиска
+        self.book = book
+        #таблицы эндшпиля (Tablebases): точная оценка позиций с тремя фигурами
+        self.tablebases = tablebases
+        #на глубине 0 доигрываются взятия и превращения (иначе оценка посреди размена)
+        self.quiescence = quiescence
+        self.ordering = MoveOrdering(MAX_PLY)
+
+        self.nodes = 0
+        self.stopped = False
+        self.best_move = None
+        self.score = 0
+        self.completed_depth = 0
+        #время от начала поиска до завершения каждой глубины
+        self.depth_times = []
+        #статистика отсечений: всего и на первом же ходе
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+        self.tb_hits = 0
+        #позиции форсированного поиска (входят и в nodes) и взятия отброшенные по SEE
+        self.q_nodes = 0
+        self.see_pruned = 0
+        #вызывается после каждой завершенной глубины: info(engine, глубина, секунды от начала поиска)
+        self.info = None
+        self._start = 0
+        self._deadline = None
+        self._node_limit = None
+        self._stop_event = None
+
+    def stop(self):
+        self.stopped = True
+
+    def ponderhit(self, time_limit):
+        '''Поиск без ограничения (на время соперника) становится обычным: время считается от его начала'''
+        #если думали дольше time_limit - поиск остановится на ближайшей проверке
+        self._deadline = self._start + time_limit
+
+    @property
+    def first_cutoff_rate(self):
+        '''Доля отсечений на первом ходе за последний поиск (чем ближе к 1, тем лучше порядок ходов)'''
+        return self.first_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def search(self, board, time_limit=None, depth=None, nodes=None, stop_event=None):
+        '''Ищет лучший ход стороны которая ходит; при нехватке времени - лучший из найденных'''
+        time_limit = self.time_limit if time_limit is None else time_limit
+        max_depth = depth or self.depth or MAX_PLY
+        self._node_limit = nodes or self.node_limit
+        #stop_event (threading.Event) прерывает поиск из другого потока
+        self._stop_event = stop_event
+
+        self.nodes = 0
+        self.stopped = False
+        self.best_move = None
+        self.score = 0
+        self.completed_depth = 0
+        self.depth_times = []
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+        self.tb_hits = 0
+        self.q_nodes = 0
+        self.see_pruned = 0
+        start = self._start = time.perf_counter()
+        self._deadline = start + time_limit if time_limit else None
+        self.tt.new_search()
+        self.ordering.new_search()
+
+        if self.book is not None:
+            move = self.book.choose(board)
+            if move is not None:
+                self.best_move = move
+                return move
+
+        moves = board.legal_moves(board.next_player)
+        if not moves:
+            return None
+        self.best_move = moves[0]
+
+        for d in range(1, max_depth + 1):
+            score, move = self._root(board, moves, d)
+            #незавершенная итерация: берем ее ход только если он найден раньше остановки
+            if move is not None:
+                self.best_move = move
+                self.score = score
+            if self.stopped:
+                break
+            self.completed_depth = d
+            self.depth_times.append(time.perf_counter() - start)
+            if self.info is not None:
+                self.info(self, d, self.depth_times[-1])
+
+            #мат найден - глубже искать незачем
+            if abs(score) >= MATE - MAX_PLY:
+                break
+
+        return self.best_move
+
+    def pv(self, board, length=None):
+        '''Главный вариант: лучший ход и дальше ходы из таблицы позиций, пока они возможны'''
+        if self.best_move is None:
+            return []
+        length = length or self.completed_depth or 1
+        line = [self.best_move]
+        seen = {board.hash}
+        piece = board.squares[self.best_move.initial.row][self.best_move.initial.col].piece
+        board.make_move(piece, self.best_move)
+        while len(line) < length and board.hash not in seen:
+            seen.add(board.hash)
+            entry = self.tt.probe(board.hash)
+            if entry is None or not entry[3]:
+                break
+            move = Move.from_code(entry[3])
+            #ключ мог совпасть у другой позиции - ход проверяем по правилам
+            if move not in board.legal_moves(board.next_player):
+                break
+            line.append(move)
+            board.make_move(board.squares[move.initial.row][move.initial.col].piece, move)
+        for move in line:
+            board.unmake_move()
+        return line
+
+    def evaluate(self, board):
+        '''Материал и поля фигур со стороны того кто ходит (суммы ведет доска)'''
+        return evaluate(board)
+
+    def _root(self, board, moves, depth):
+        #сначала лучший ход прошлой итерации
+        self.ordering.sort(board, moves, 0, move_code(self.best_move))
+
+        alpha, beta = -INFINITY, INFINITY
+        best_move = None
+        for move in moves:
+            piece = board.squares[move.initial.row][move.initial.col].piece
+            board.make_move(piece, move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, 1)
+            board.unmake_move()
+
+            if self.stopped:
+                break
+            if score > alpha:
+                alpha = score
+                best_move = move
+
+        if best_move is not None and not self.stopped:
+            self.tt.store(board.hash, depth, alpha, EXACT, move_code(best_move))
+        return alpha, best_move
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        if (self.nodes & 1023) == 0:
+            self._check_limits()
+        if self.stopped:
+            return 0
+
+        #повторение позиции - ничья
+        if board.repetitions():
+            return 0
+
+        #позиция из таблицы эндшпиля - искать дальше незачем
+        if self.tablebases is not None and board.piece_count <= 3:
+            value = self.tablebases.probe(board)
+            if value is not None:
+                self.tb_hits += 1
+                if not value:
+                    return 0
+                #value - 1 полуходов до мата: нечетное - мы ставим мат, четное - нам
+                dtm = value - 1
+                return MATE - ply - dtm if dtm % 2 else -MATE + ply + dtm
+
+        alpha_orig = alpha
+        tt_move = 0
+        entry = self.tt.probe(board.hash)
+        if entry is not None:
+            tt_depth, tt_score, bound, tt_move = entry
+            if tt_depth >= depth:
+                tt_score = self._from_tt(tt_score, ply)
+                if bound == EXACT:
+                    return tt_score
+                if bound == LOWER and tt_score >= beta:
+                    return tt_score
+                if bound == UPPER and tt_score <= alpha:
+                    return tt_score
+
+        color = board.next_player
+        if depth <= 0:
+            if self.quiescence:
+                return self._quiesce(board, alpha, beta, ply)
+            return self.evaluate(board)
+
+        moves = board.legal_moves(color)
+        if not moves:
+            #мат или пат
+            return -MATE + ply if board.king_in_check(color) else 0
+
+        #ход из таблицы, взятия, ходы-убийцы, история
+        self.ordering.sort(board, moves, ply, tt_move)
+
+        squares = board.squares
+        best = -INFINITY
+        best_move = None
+        for index, move in enumerate(moves):
+            piece = squares[move.initial.row][move.initial.col].piece
+            board.make_move(piece, move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+
+            if self.stopped:
+                return 0
+            if score > best:
+                best = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.cutoffs += 1
+                        if index == 0:
+                            self.first_cutoffs += 1
+                        self.ordering.cutoff(board, move, depth, ply)
+                        break
+
+        if best <= alpha_orig:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(board.hash, depth, self._to_tt(best, ply), bound, move_code(best_move))
+        return best
+
+    def _quiesce(self, board, alpha, beta, ply):
+        #только взятия и превращения; под шахом - все ответы на шах
+        self.nodes += 1
+        self.q_nodes += 1
+        if (self.nodes & 1023) == 0:
+            self._check_limits()
+        if self.stopped:
+            return 0
+
+        color = board.next_player
+        in_check = board.king_in_check(color)
+        if in_check:
+            moves = board.legal_moves(color)
+            if not moves:
+                return -MATE + ply
+            best = -INFINITY
+        else:
+            #оценка если ничего не брать: взятия могут ее только улучшить
+            best = self.evaluate(board)
+            if best >= beta or ply >= MAX_PLY:
+                return best
+            alpha = max(alpha, best)
+            moves = board.capture_moves(color)
+
+        self.ordering.sort(board, moves, ply)
+        squares = board.squares
+        for move in moves:
+            #проигрывающий размен не смотрим (от шаха так не отказываемся)
+            if not in_check and see(board, move) < 0:
+                self.see_pruned += 1
+                continue
+            board.make_move(squares[move.initial.row][move.initial.col].piece, move)
+            score = -self._quiesce(board, -beta, -alpha, ply + 1)
+            board.unmake_move()
+
+            if self.stopped:
+                return 0
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    def _check_limits(self):
+        if self._stop_event is not None and self._stop_event.is_set():
+            self.stopped = True
+            return
+        if self.completed_depth == 0:
+            #первая итерация всегда доводится до конца
+            return
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            self.stopped = True
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            self.stopped = True
+
+    #оценки мата в таблице хранятся от текущей позиции, а не от корня
+    @staticmethod
+    def _to_tt(score, ply):
+        if score >= MATE - MAX_PLY:
+            return score + ply
+        if score <= -MATE + MAX_PLY:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_tt(score, ply):
+        if score >= MATE - MAX_PLY:
+            return score - ply
+        if score <= -MATE + MAX_PLY:
+            return score + ply
+        return score
@@ -0,0 +1,93 @@
+import argparse
+import sys
+import time
+
+from core.fen import load_fen
+from engine import Engine
+
+
+def read_epd(lines):
+    '''Позиции EPD по одной: (FEN, {код операции: операнды}), файл не читается целиком'''
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        fields = line.split(None, 4)
+        if len(fields) < 4:
+            continue
+        fen = ' '.join(fields[:4])
+        operations = {}
+        for operation in (fields[4] if len(fields) > 4 else '').split(';'):
+            operation = operation.strip()
+            if operation:
+                opcode, _, operands = operation.partition(' ')
+                operations[opcode] = operands.strip().strip('"')
+        yield fen, operations
+
+
+def format_epd(fen, operations):
+    parts = [fen]
+    for opcode, operands in operations.items():
+        if opcode in ('id', 'c0'):
+            operands = f'"{operands}"'
+        parts.append(f'{opcode} {operands};' if operands else f'{opcode};')
+    return ' '.join(parts)
+
+
+def analyse(engine, fen, operations, **limits):
+    '''Ищет ход и добавляет результат в операции EPD: pm, ce, acd, acn, acs'''
+    board, color = load_fen(fen)
+    start = time.perf_counter()
+    move = engine.search(board, **limits)
+    result = dict(operations)
+    result['pm'] = str(move) if move is not None else '-'
+    result['ce'] = str(engine.score)
+    result['acd'] = str(engine.completed_depth)
+    result['acn'] = str(engine.nodes)
+    result['acs'] = f'{time.perf_counter() - start:.2f}'
+    return result
+
+
+def run(source, output, engine, **limits):
+    '''Анализирует позиции по мере чтения и сразу пишет результат: в памяти только одна позиция'''
+    count = 0
+    for fen, operations in read_epd(source):
+        result = analyse(engine, fen, operations, **limits)
+        output.write(format_epd(fen, result) + '\n')
+        output.flush()
+        count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Анализ позиций из файла EPD с записью результатов по мере готовности')
+    parser.add_argument('input', help='файл EPD (- для stdin)')
+    parser.add_argument('-o', '--output', default='-', help='файл результатов (по умолчанию stdout)')
+    parser.add_argument('--time', type=float, default=1.0, help='секунд на позицию')
+    parser.add_argument('--depth', type=int, help='глубина поиска')
+    parser.add_argument('--workers', type=int, default=1, help='процессов на позицию (параллельный поиск)')
+    args = parser.parse_args(argv)
+
+    if args.workers > 1:
+        from parallel import ParallelSearch
+        engine = ParallelSearch(args.workers)
+    else:
+        engine = Engine()
+    #0 - без ограничения по времени (None означал бы секунду Engine по умолчанию)
+    limits = {'time_limit': 0 if args.depth else args.time, 'depth': args.depth}
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        count = run(source, output, engine, **limits)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    print(f'{count} positions in {time.perf_counter() - start:.1f} s', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,75 +1,107 @@
+import os
+import time
 import pygame
 
 from config import Config
 from const import *
-from board import Board
+from core import Board, Square
 from dragger import Dragger
-from square import Square
+from engine import Engine
+from book import OpeningBook
+from tablebase import Tablebases
+from pgn import to_pgn
+from worker import SearchWorker
+from textures import Textures
+
+
+#все клетки доски (row, col)
+ALL_SQUARES = [(row, col) for row in range(ROWS) for col in range(COLS)]
+
 
 class Game:
 
-    def __init__(self):
+    def __init__(self, textures=None, book=None, tablebases=None):
         self.next_player = 'white'
         self.hovered_sqr = None
         self.board = Board()
-        self.dragger = Dragger()
+        #кэш картинок общий для доски и перетаскивания, переживает перезапуск партии
+        self.textures = textures or Textures()
+        self.dragger = Dragger(self.textures)
         self.config = Config()
+        #без файла книги компьютер считает каждый ход сам
+        if book is None and os.path.exists(BOOK_PATH):
+            book = OpeningBook(BOOK_PATH)
+        self.book = book
+        if tablebases is None and os.path.isdir(TABLEBASE_PATH):
+            tablebases = Tablebases(TABLEBASE_PATH)
+        self.tablebases = tablebases
+        self.engine = Engine(time_limit=1.0, book=book, tablebases=tablebases)
+        #поиск хода компьютера идет в отдельном потоке
+        self.worker = SearchWorker(self.engine)
+        #цвет за который играет компьютер (None - играют два человека)
+        self.computer = None
+        #компьютер думает на время человека над позицией после ожидаемого ответа
+        self.ponder = True
+        #клетки которые надо перерисовать в следующем кадре
+        self.dirty = set()
+        self.full_redraw = True
+        self._drag_rect = None
+        self._thinking_shown = False
 
     #вывод заднего фона
-    def show_bg(self, surface):
+    def show_bg(self, surface, squares=None):
         theme = self.config.theme
 
-        for row in range(ROWS):
-            for col in range(COLS):
-                #цвет
-                color = theme.bg.light if (row+col) % 2 == 0 else theme.bg.dark
-                #квадрат
-                rect = (col * SQSIZE, row * SQSIZE, SQSIZE, SQSIZE)
-                #рисуем
-                pygame.draw.rect(surface, color, rect)
+        for row, col in (ALL_SQUARES if squares is None else squares):
+            #цвет
+            color = theme.bg.light if (row+col) % 2 == 0 else theme.bg.dark
+            #квадрат
+            rect = (col * SQSIZE, row * SQSIZE, SQSIZE, SQSIZE)
+            #рисуем
+            pygame.draw.rect(surface, color, rect)
+
+            #рисуем координаты поля
+            if col == 0:
+                color = theme.bg.dark if row % 2 == 0 else theme.bg.light
+                label = self.config.font.render(str(ROWS-row), 1, color)
+                label_pos = (5, 5 + row * SQSIZE)
+                surface.blit(label, label_pos)
 
-                #рисуем координаты поля
-                if col == 0:
-                    color = theme.bg.dark if row % 2 == 0 else theme.bg.light
-                    label = self.config.font.render(str(ROWS-row), 1, color)
-                    label_pos = (5, 5 + row * SQSIZE)
-                    surface.blit(label, label_pos)
-                
-                if row == 7:
-                    color = theme.bg.dark if (row + col) % 2 == 0 else theme.bg.light
-                    label = self.config.font.render(Square.get_alphacol(col), 1, color)
-                    label_pos = (col * SQSIZE + SQSIZE - 20, HEIGHT - 20)
-                    surface.blit(label, label_pos)
+            if row == 7:
+                color = theme.bg.dark if (row + col) % 2 == 0 else theme.bg.light
+                label = self.config.font.render(Square.get_alphacol(col), 1, color)
+                label_pos = (col * SQSIZE + SQSIZE - 20, HEIGHT - 20)
+                surface.blit(label, label_pos)
 
     #вывод фигур
-    def show_pieces(self, surface):
-        for row in range(ROWS):
-            for col in range(COLS):
-                #проверка на фигуру
-                if self.board.squares[row][col].has_piece():
-                    piece = self.board.squares[row][col].piece
-
-                    #все части кроме той которую перетаскиваем
-                    if piece is not self.dragger.piece:
-                        piece.set_texture(size=80)
-                        img = pygame.image.load(piece.texture)
-                        img_center = col * SQSIZE + SQSIZE // 2, row * SQSIZE + SQSIZE // 2
-                        piece.texture_rect = img.get_rect(center=img_center)
-                        surface.blit(img, piece.texture_rect)
-    
-    def show_moves(self, surface):
+    def show_pieces(self, surface, squares=None):
+        for row, col in (ALL_SQUARES if squares is None else squares):
+            #проверка на фигуру
+            if self.board.squares[row][col].has_piece():
+                piece = self.board.squares[row][col].piece
+
+                #все части кроме той которую перетаскиваем
+                if piece is not self.dragger.piece:
+                    img = self.textures.get(piece, size=80)
+                    img_center = col * SQSIZE + SQSIZE // 2, row * SQSIZE + SQSIZE // 2
+                    piece.texture_rect = img.get_rect(center=img_center)
+                    surface.blit(img, piece.texture_rect)
+
+    def show_moves(self, surface, squares=None):
         theme = self.config.theme
 
         if self.dragger.dragging:
-            piece = self.dragger.piece
-            
-            #перебираем все возможные ходы
-            for move in piece.moves:
+            dragger = self.dragger
+
+            #перебираем все возможные ходы (из кэша позиции)
+            for move in self.board.cached_moves(dragger.initial_row, dragger.initial_col):
+                if squares is not None and (move.final.row, move.final.col) not in squares:
+                    continue
                 color = theme.moves.light if (move.final.row + move.final.col) % 2 == 0 else theme.moves.dark
                 rect = (move.final.col * SQSIZE, move.final.row * SQSIZE, SQSIZE, SQSIZE)
                 pygame.draw.rect(surface, color, rect)
-    
-    def show_last_move(self, surface):
+
+    def show_last_move(self, surface, squares=None):
         theme = self.config.theme
 
         if self.board.last_move:
@@ -77,26 +109,193 @@ class Game:
             final = self.board.last_move.final
 
             for pos in [initial, final]:
+                if squares is not None and (pos.row, pos.col) not in squares:
+                    continue
                 color = theme.trace.light if (pos.row + pos.col) % 2 == 0 else theme.trace.dark
                 rect = (pos.col * SQSIZE, pos.row * SQSIZE, SQSIZE, SQSIZE)
                 pygame.draw.rect(surface, color, rect)
-    
-    def show_hover(self, surface):
+
+    def show_hover(self, surface, squares=None):
         if self.hovered_sqr:
+            if squares is not None and (self.hovered_sqr.row, self.hovered_sqr.col) not in squares:
+                return
             color = (180, 180, 180)
             rect = (self.hovered_sqr.col * SQSIZE, self.hovered_sqr.row * SQSIZE, SQSIZE, SQSIZE)
             pygame.draw.rect(surface, color, rect, width=3)
 
+    def render(self, surface):
+        '''Перерисовывает только изменившиеся клетки, возвращает прямоугольники для display.update'''
+        dragger = self.dragger
+        drag_rect = dragger.rect() if dragger.dragging else None
+        thinking = self.worker.thinking
+
+        #перетаскиваемая фигура сдвинулась: стираем старое место и рисуем новое
+        if drag_rect != self._drag_rect:
+            self.mark_rect(self._drag_rect)
+            self.mark_rect(drag_rect)
+
+        #надпись "думает" появилась или исчезла
+        if thinking != self._thinking_shown:
+            self.full_redraw = True
+
+        if self.full_redraw:
+            self.dirty = set(ALL_SQUARES)
+        elif not self.dirty:
+            return []
+
+        #фигура и надпись поверх клеток рисуются целиком, поэтому и все клетки под ними
+        if drag_rect is not None:
+            self.mark_rect(drag_rect)
+        if thinking:
+            self.mark_rect(self._thinking_label()[1])
+
+        squares = self.dirty
+        self.show_bg(surface, squares)
+        self.show_last_move(surface, squares)
+        self.show_moves(surface, squares)
+        self.show_pieces(surface, squares)
+        self.show_hover(surface, squares)
+
+        if drag_rect is not None:
+            dragger.update_blit(surface)
+        self.show_thinking(surface)
+
+        if self.full_redraw:
+            rects = [pygame.Rect(0, 0, WIDTH, HEIGHT)]
+        else:
+            rects = [pygame.Rect(col * SQSIZE, row * SQSIZE, SQSIZE, SQSIZE) for row, col in squares]
+
+        self.dirty = set()
+        self.full_redraw = False
+        self._drag_rect = drag_rect
+        self._thinking_shown = thinking
+        return rects
+
+    def mark_square(self, row, col):
+        self.dirty.add((row, col))
+
+    def mark_rect(self, rect):
+        #все клетки которые задевает прямоугольник
+        if rect is None:
+            return
+        first_row, last_row = max(0, rect.top // SQSIZE), min(ROWS - 1, (rect.bottom - 1) // SQSIZE)
+        first_col, last_col = max(0, rect.left // SQSIZE), min(COLS - 1, (rect.right - 1) // SQSIZE)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                self.dirty.add((row, col))
+
+    def mark_moves(self, piece):
+        #исходная клетка и подсказки ходов фигуры
+        self.mark_square(self.dragger.initial_row, self.dragger.initial_col)
+        for move in self.board.cached_moves(self.dragger.initial_row, self.dragger.initial_col):
+            self.mark_square(move.final.row, move.final.col)
+
+    def mark_all(self):
+        self.full_redraw = True
 
     #устанавливаем очередность хода
     def next_turn(self):
         self.next_player = 'white' if self.next_player == 'black' else 'black'
 
+    def set_computer(self, color):
+        self.computer = color
+
+    def save_pgn(self):
+        '''Записывает партию в games/game-<дата>-<время>.pgn, возвращает путь к файлу'''
+        now = time.localtime()
+        headers = {
+            'Event': 'Chess-AI',
+            'Date': time.strftime('%Y.%m.%d', now),
+            'White': 'Computer' if self.computer == 'white' else 'Human',
+            'Black': 'Computer' if self.computer == 'black' else 'Human',
+        }
+        os.makedirs(GAMES_PATH, exist_ok=True)
+        path = os.path.join(GAMES_PATH, time.strftime('game-%Y%m%d-%H%M%S.pgn', now))
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(to_pgn(self.board, headers))
+        return path
+
+    def change_ponder(self):
+        self.ponder = not self.ponder
+        if not self.ponder and self.worker.pondering:
+            self.worker.cancel()
+
+    def change_computer(self):
+        #по кругу: без компьютера -> за черных -> за белых
+        colors = [None, 'black', 'white']
+        self.computer = colors[(colors.index(self.computer) + 1) % len(colors)]
+        self.worker.cancel()
+
+    def is_computer_turn(self):
+        return self.computer == self.next_player
+
+    def update_computer(self):
+        '''Вызывается каждый кадр: запускает поиск за компьютер и делает ход когда он готов'''
+        if not self.is_computer_turn():
+            return
+
+        if not self.worker.thinking:
+            #если ходов нет (мат или пат) поиск не запускаем
+            if self.board.legal_moves(self.next_player):
+                self.worker.start(self.board)
+            return
+
+        done, move = self.worker.poll()
+        if done and move is not None:
+            self.play_move(move)
+            self.start_ponder()
+
+    def start_ponder(self):
+        '''Поиск без ограничения по времени в позиции после ожидаемого хода человека'''
+        move = self.worker.ponder_move
+        if not self.ponder or move is None:
+            return
+        board = self.board
+        piece = board.squares[move.initial.row][move.initial.col].piece
+        if piece is None or move not in board.legal_moves(board.next_player):
+            return
+        #поток копирует доску сам, ожидаемый ход делаем и отменяем на оригинале
+        board.make_move(piece, move)
+        self.worker.start(board, ponder=True, time_limit=0)
+        board.unmake_move()
+
+    def human_moved(self, move):
+        '''Ход человека: если его ждали - поиск продолжается, иначе он прерывается (таблица позиций остается)'''
+        if not self.worker.pondering:
+            return
+        if move == self.worker.ponder_move and self.is_computer_turn():
+            self.worker.ponderhit(self.engine.time_limit)
+        else:
+            self.worker.cancel()
+
+    def play_move(self, move):
+        piece = self.board.squares[move.initial.row][move.initial.col].piece
+        captured = self.board.move(piece, move) is not None
+        self.board.set_true_en_passant(piece)
+        self.play_sound(captured)
+        self.next_turn()
+        self.mark_all()
+
+    def show_thinking(self, surface):
+        if self.worker.thinking:
+            label, rect = self._thinking_label()
+            surface.blit(label, rect)
+
+    def _thinking_label(self):
+        label = self.config.font.render('Компьютер думает...', 1, (60, 60, 60))
+        return label, label.get_rect(topright=(WIDTH - 10, 5))
+
     def set_hover(self, row, col):
-        self.hovered_sqr = self.board.squares[row][col]
+        hovered_sqr = self.board.squares[row][col]
+        if hovered_sqr is not self.hovered_sqr:
+            if self.hovered_sqr:
+                self.mark_square(self.hovered_sqr.row, self.hovered_sqr.col)
+            self.mark_square(row, col)
+        self.hovered_sqr = hovered_sqr
     
     def change_theme(self):
         self.config.change_theme()
+        self.mark_all()
 
     def play_sound(self, captured=False):
         if captured:
@@ -105,4 +304,8 @@ class Game:
             self.config.move_sound.play()
     
     def reset(self):
-        self.__init__()
+        #поиск прошлой партии прерываем не дожидаясь его конца
+        self.worker.cancel()
+        computer, ponder = self.computer, self.ponder
+        self.__init__(self.textures, self.book, self.tablebases)
+        self.computer, self.ponder = computer, ponder
@@ -3,8 +3,7 @@ import sys
 
 from const import *
 from game import Game
-from move import Move
-from square import Square
+from core import Move, Square
 
 
 class Main:
@@ -21,18 +20,11 @@ class Main:
         screen = self.screen
         board = self.game.board
         dragger = self.game.dragger
+        clock = pygame.time.Clock()
         
         while True:
-            #показываем доску
-            game.show_bg(screen)
-            game.show_last_move(screen)
-            game.show_moves(screen)
-            game.show_pieces(screen)
-
-            game.show_hover(screen)
-
-            if dragger.dragging:
-                dragger.update_blit(screen)
+            #ход компьютера (поиск идет в отдельном потоке)
+            game.update_computer()
 
             for event in pygame.event.get():
 
@@ -46,16 +38,13 @@ class Main:
                     #проверка клика на наличие фигуры
                     if board.squares[clicked_row][clicked_col].has_piece():
                         piece = board.squares[clicked_row][clicked_col].piece
-                        #проверяем цвет фигуры с очередью хода
-                        if piece.color == game.next_player:
-                            board.calc_moves(piece, clicked_row, clicked_col, bool=True)
+                        #проверяем цвет фигуры с очередью хода (пока компьютер думает ходить нельзя)
+                        if piece.color == game.next_player and not game.is_computer_turn():
+                            #ходы берутся из кэша позиции: повторный клик их не пересчитывает
                             dragger.save_initial(event.pos)
                             dragger.drag_piece(piece)
-                            #показываем доску
-                            game.show_bg(screen)
-                            game.show_last_move(screen)
-                            game.show_moves(screen)
-                            game.show_pieces(screen)
+                            #перерисуем исходную клетку и подсказки ходов
+                            game.mark_moves(piece)
 
                 #движение мышью
                 elif event.type == pygame.MOUSEMOTION:
@@ -66,13 +55,6 @@ class Main:
 
                     if dragger.dragging:
                         dragger.update_mouse(event.pos)
-                        #показываем доску
-                        game.show_bg(screen)
-                        game.show_last_move(screen)
-                        game.show_moves(screen)
-                        game.show_pieces(screen)
-                        game.show_hover(screen)
-                        dragger.update_blit(screen)
 
                 #отпускание клавиши мыши
                 elif event.type == pygame.MOUSEBUTTONUP:
@@ -88,23 +70,25 @@ class Main:
                         final = Square(released_row, released_col)
                         move = Move(inital, final)
 
-                        #проверка валидности хода
-                        if board.valid_move(dragger.piece, move):
+                        #проверка валидности хода по кэшу легальных ходов позиции
+                        if move in board.cached_moves(dragger.initial_row, dragger.initial_col):
 
-                            captured = board.squares[released_row][released_col].has_piece()
-
-                            board.move(dragger.piece, move)
+                            #доска возвращает съеденную фигуру (и при взятии на проходе)
+                            captured = board.move(dragger.piece, move) is not None
 
                             board.set_true_en_passant(dragger.piece)
 
                             #звук хода или атаки на фигуру
                             game.play_sound(captured)
                             #рисуем ход на доске
-                            game.show_bg(screen)
-                            game.show_last_move(screen)
-                            game.show_pieces(screen)
+                            game.mark_all()
                             #меняем очередь хода
                             game.next_turn()
+                            #компьютер мог уже думать над этим ходом
+                            game.human_moved(move)
+                        else:
+                            #убираем подсказки, фигура возвращается на место
+                            game.mark_moves(dragger.piece)
 
                     dragger.undrag_piece()
 
@@ -113,6 +97,18 @@ class Main:
 
                     if event.key == pygame.K_t:
                         game.change_theme()
+
+                    #компьютер играет за черных, за белых или выключен
+                    if event.key == pygame.K_c:
+                        game.change_computer()
+
+                    #думать на время человека или нет
+                    if event.key == pygame.K_p:
+                        game.change_ponder()
+
+                    #сохраняем партию в PGN
+                    if event.key == pygame.K_s:
+                        game.save_pgn()
                     
                     if event.key == pygame.K_r:
                         game.reset()
@@ -124,8 +120,14 @@ class Main:
                 elif event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
-            
-            pygame.display.update()
+
+            #рисуем только изменившиеся клетки
+            rects = game.render(screen)
+            if rects:
+                pygame.display.update(rects)
+
+            #ограничиваем частоту кадров, в простое цикл спит
+            clock.tick(FPS)
 
 main = Main()
 main.mainloop()
@@ -0,0 +1,76 @@
+from core.piece import *
+
+
+#порядок групп: ход из таблицы, взятия, ходы-убийцы, остальные по истории
+TT_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORES = (1 << 27, (1 << 27) - 1)
+
+#история не должна догнать ходы-убийцы
+HISTORY_LIMIT = 1 << 26
+
+
+class MoveOrdering:
+    '''Порядок ходов для альфа-бета: ход из таблицы, MVV-LVA, ходы-убийцы и таблица истории'''
+
+    def __init__(self, max_ply=128):
+        self.max_ply = max_ply
+        self.clear()
+
+    def clear(self):
+        #два хода-убийцы (тихие ходы вызвавшие отсечение) на каждый полуход от корня
+        self.killers = [[0, 0] for ply in range(self.max_ply + 1)]
+        #история: [цвет][код хода] - как часто тихий ход вызывал отсечение
+        self.history = {'white': [0] * 4096, 'black': [0] * 4096}
+
+    def new_search(self):
+        #старые ходы-убийцы к новой позиции не относятся, история стареет вдвое
+        self.killers = [[0, 0] for ply in range(self.max_ply + 1)]
+        for table in self.history.values():
+            for code in range(4096):
+                table[code] >>= 1
+
+    def sort(self, board, moves, ply, tt_move=0):
+        '''Сортирует ходы на месте, лучшие первыми'''
+        squares = board.squares
+        killers = self.killers[ply]
+        history = self.history[board.next_player]
+
+        def score(move):
+            code = move.code
+            if code == tt_move:
+                return TT_SCORE
+            initial, final = move.initial, move.final
+            piece = squares[initial.row][initial.col].piece
+            victim = squares[final.row][final.col].piece
+            if victim is None and isinstance(piece, Pawn) and final.col != initial.col:
+                #взятие на проходе
+                victim = piece
+            if victim is not None:
+                #самая ценная жертва, самый дешевый нападающий (король - самый дорогой)
+                return CAPTURE_SCORE + int(abs(victim.value) * 100) * 16 - min(int(abs(piece.value)), 15)
+            if code == killers[0]:
+                return KILLER_SCORES[0]
+            if code == killers[1]:
+                return KILLER_SCORES[1]
+            return history[code]
+
+        moves.sort(key=score, reverse=True)
+
+    def cutoff(self, board, move, depth, ply):
+        '''Запоминает тихий ход вызвавший отсечение (board - позиция до хода)'''
+        initial, final = move.initial, move.final
+        if board.squares[final.row][final.col].piece is not None:
+            return
+        piece = board.squares[initial.row][initial.col].piece
+        if isinstance(piece, Pawn) and final.col != initial.col:
+            return
+
+        code = move.code
+        killers = self.killers[ply]
+        if killers[0] != code:
+            killers[1] = killers[0]
+            killers[0] = code
+
+        history = self.history[board.next_player]
+        history[code] = min(history[code] + depth * depth, HISTORY_LIMIT)
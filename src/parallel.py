@@ -0,0 +1,130 @@
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+
+from engine import Engine
+from transposition import TranspositionTable, shared_buffers
+
+
+def _run(worker_id, board, buffers, tt_size, generation, limits, stop, results, book, tablebases):
+    #процесс поиска: своя копия доски, общая таблица позиций
+    tt = TranspositionTable(tt_size, shared=buffers)
+    tt.generation = generation
+    engine = Engine(tt=tt, book=book if worker_id == 0 else None, tablebases=tablebases)
+    if worker_id:
+        #помощники перебирают равные тихие ходы в другом порядке и заполняют таблицу другими ветками
+        rng = random.Random(worker_id)
+        for table in engine.ordering.history.values():
+            for code in range(len(table)):
+                table[code] = rng.randrange(8)
+
+    move = engine.search(board, stop_event=stop, **limits)
+    results.put((worker_id, move, engine.score, engine.completed_depth, engine.depth_times, engine.nodes))
+
+
+class ParallelSearch:
+    '''Поиск в нескольких процессах с общей таблицей позиций (Lazy SMP)'''
+
+    def __init__(self, workers=None, tt_size=16, book=None, tablebases=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.tt_size = tt_size
+        self.book = book
+        self.tablebases = tablebases
+        #таблица живет между поисками в общей памяти
+        self.buffers = shared_buffers(tt_size)
+        self.generation = 0
+
+        self.best_move = None
+        self.score = 0
+        self.completed_depth = 0
+        self.depth_times = []
+        self.nodes = 0
+
+    def clear(self):
+        TranspositionTable(self.tt_size, shared=self.buffers).clear()
+        self.generation = 0
+
+    def search(self, board, time_limit=None, depth=None, nodes=None):
+        '''Ищет ход во всех процессах; ответ, глубина и время до глубины - от главного процесса 0'''
+        #при заданных глубине или узлах Engine не должен брать свою секунду по умолчанию
+        if time_limit is None and (depth or nodes):
+            time_limit = 0
+        limits = {'time_limit': time_limit, 'depth': depth, 'nodes': nodes}
+        context = multiprocessing.get_context()
+        stop = context.Event()
+        results = context.Queue()
+        self.generation = (self.generation + 1) & 255
+
+        processes = [
+            context.Process(
+                target=_run,
+                args=(worker_id, board, self.buffers, self.tt_size, self.generation, limits, stop, results, self.book, self.tablebases),
+                daemon=True,
+            )
+            for worker_id in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+
+        #помощников останавливаем как только главный процесс закончил
+        reports = {}
+        while 0 not in reports:
+            worker_id, *report = results.get()
+            reports[worker_id] = report
+        stop.set()
+        while len(reports) < self.workers:
+            try:
+                worker_id, *report = results.get(timeout=5)
+            except queue.Empty:
+                break
+            reports[worker_id] = report
+        for process in processes:
+            process.join()
+
+        self.best_move, self.score, self.completed_depth, self.depth_times, _ = reports[0]
+        self.nodes = sum(report[4] for report in reports.values())
+        return self.best_move
+
+
+def bench(workers, depth, positions):
+    '''Время до глубины depth для каждой позиции: {число процессов: [секунды]}'''
+    from core.fen import load_fen
+
+    times = {}
+    for count in workers:
+        times[count] = []
+        for fen in positions:
+            board, color = load_fen(fen)
+            search = ParallelSearch(count)
+            search.search(board, depth=depth)
+            if search.completed_depth < depth:
+                raise RuntimeError(f'workers {count}: search stopped at depth {search.completed_depth} of {depth} ({fen})')
+            times[count].append(search.depth_times[-1])
+            print(f'workers {count:2}  depth {search.completed_depth}  {search.depth_times[-1]:7.2f} s  {search.nodes:8} nodes  {search.best_move}  {fen}')
+    return times
+
+
+def main(argv=None):
+    from perft import POSITIONS
+
+    parser = argparse.ArgumentParser(description='Ускорение параллельного поиска: время до глубины по сравнению с одним процессом')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--fen', action='append', help='позиция (можно несколько раз), по умолчанию позиции perft')
+    args = parser.parse_args(argv)
+
+    positions = args.fen or [fen for name, fen, counts in POSITIONS]
+    workers = sorted(set([1] + args.workers))
+    times = bench(workers, args.depth, positions)
+
+    base = sum(times[1])
+    print(f'cores available: {os.cpu_count()}')
+    for count in workers:
+        total = sum(times[count])
+        print(f'workers {count:2}  time to depth {args.depth}: {total:7.2f} s  speedup {base / total:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
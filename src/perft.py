@@ -0,0 +1,123 @@
+import argparse
+import sys
+import time
+
+from core.fen import load_fen, START_FEN
+from bitboard import BitBoard
+
+
+#эталонные позиции: имя, FEN, число позиций на глубинах 1, 2, 3...
+#пешка превращается только в ферзя (Board.check_promotion), поэтому для позиций
+#с превращениями числа посчитаны без превращений в коня, слона и ладью
+POSITIONS = [
+    ('startpos', START_FEN,
+     [20, 400, 8902, 197281, 4865609]),
+    ('kiwipete', 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+     [48, 2039, 97862, 4074224]),
+    ('position3', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1',
+     [14, 191, 2812, 43238, 674624]),
+    ('position4', 'r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1',
+     [6, 228, 8087, 320802]),
+    ('position5', 'rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8',
+     [41, 1373, 54007, 1806790]),
+    ('position6', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+     [46, 2079, 89890, 3894594]),
+]
+
+
+def rival(color):
+    return 'black' if color == 'white' else 'white'
+
+
+def perft(board, color, depth):
+    '''Число позиций на глубине depth (ходы через make_move / unmake_move)'''
+    if depth == 0:
+        return 1
+
+    moves = board.legal_moves(color)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        piece = board.squares[move.initial.row][move.initial.col].piece
+        board.make_move(piece, move)
+        nodes += perft(board, rival(color), depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, color, depth):
+    '''Число позиций на глубине depth после каждого первого хода'''
+    result = []
+    for move in board.legal_moves(color):
+        piece = board.squares[move.initial.row][move.initial.col].piece
+        board.make_move(piece, move)
+        result.append((str(move), perft(board, rival(color), depth - 1)))
+        board.unmake_move()
+    return result
+
+
+def bitboard_divide(bitboard, depth):
+    result = []
+    for code in bitboard.legal_moves():
+        bitboard.make_move(code)
+        result.append((str(BitBoard.to_move(code)), bitboard.perft(depth - 1)))
+        bitboard.unmake_move()
+    return result
+
+
+def count(fen, depth, backend='board'):
+    board, color = load_fen(fen)
+    if backend == 'bitboard':
+        return BitBoard.from_board(board, color).perft(depth)
+    return perft(board, color, depth)
+
+
+def run(depth, backend='board', positions=POSITIONS):
+    '''Сверяет генератор ходов с эталонными числами, возвращает True если все совпало'''
+    ok = True
+    total_nodes = 0
+    total_time = 0.0
+
+    for name, fen, expected in positions:
+        for d in range(1, min(depth, len(expected)) + 1):
+            start = time.perf_counter()
+            nodes = count(fen, d, backend)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+
+            status = 'ok' if nodes == expected[d-1] else f'FAIL (expected {expected[d-1]})'
+            ok = ok and nodes == expected[d-1]
+            nps = nodes / elapsed if elapsed else 0
+            print(f'{name:<10} depth {d}  {nodes:>9} nodes  {elapsed:8.3f} s  {nps:>9.0f} nps  {status}')
+
+    if total_time:
+        print(f'total {total_nodes} nodes in {total_time:.3f} s, {total_nodes / total_time:.0f} nps ({backend})')
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Perft: проверка и замер скорости генератора ходов')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--backend', choices=['board', 'bitboard'], default='board', help='bitboard - сверка с генератором на масках (движок на нем не работает)')
+    parser.add_argument('--fen', help='разбить по первым ходам (divide) для этой позиции')
+    args = parser.parse_args(argv)
+
+    if args.fen:
+        board, color = load_fen(args.fen)
+        if args.backend == 'bitboard':
+            result = bitboard_divide(BitBoard.from_board(board, color), args.depth)
+        else:
+            result = divide(board, color, args.depth)
+        for move, nodes in result:
+            print(f'{move}: {nodes}')
+        print(f'total: {sum(nodes for move, nodes in result)}')
+        return 0
+
+    return 0 if run(args.depth, args.backend) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
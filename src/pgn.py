@@ -0,0 +1,180 @@
+import argparse
+import copy
+import itertools
+import multiprocessing
+import re
+import sys
+import time
+
+from core import Board
+from core.fen import START_FEN
+from core.san import to_san, parse_san, IllegalMoveError
+
+
+TAG = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+#комментарии, варианты, NAG, номера ходов и результаты - все кроме самих ходов
+TOKEN = re.compile(r'\{[^}]*\}?|;.*|\(|\)|\$\d+|\d+\.+|\.+|1-0|0-1|1/2-1/2|\*|[^\s{}();$.]+')
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+
+def read_games(lines):
+    '''Партии PGN по одной: (заголовки, список ходов SAN, результат); файл читается построчно'''
+    headers = {}
+    moves = []
+    result = '*'
+    depth = 0
+    comment = False
+    in_moves = False
+
+    for line in lines:
+        line = line.strip()
+        if comment:
+            #многострочный комментарий в фигурных скобках
+            if '}' not in line:
+                continue
+            line = line[line.index('}') + 1:]
+            comment = False
+
+        if not line or line.startswith('%'):
+            continue
+
+        match = TAG.match(line)
+        if match and depth == 0:
+            if in_moves:
+                #заголовок новой партии без результата у прошлой
+                yield headers, moves, result
+                headers, moves, result, in_moves = {}, [], '*', False
+            headers[match.group(1)] = match.group(2)
+            continue
+
+        in_moves = True
+        for token in TOKEN.findall(line):
+            if token.startswith('{'):
+                comment = not token.endswith('}')
+            elif token.startswith(';') or token.startswith('$') or token[0].isdigit() and token.endswith('.') or token.startswith('.'):
+                continue
+            elif token == '(':
+                depth += 1
+            elif token == ')':
+                depth -= 1
+            elif depth:
+                #ходы вариантов не проигрываются
+                continue
+            elif token in RESULTS:
+                result = token
+                yield headers, moves, result
+                headers, moves, result, in_moves = {}, [], '*', False
+            else:
+                moves.append(token)
+
+    if in_moves or headers:
+        yield headers, moves, result
+
+
+def replay(game):
+    '''Проигрывает партию по правилам доски: (число ходов, None) или (номер полухода, ход, ошибка)'''
+    headers, moves, result = game
+    board = Board.from_fen(headers['FEN']) if 'FEN' in headers else Board()
+    for ply, san in enumerate(moves):
+        try:
+            piece, move = parse_san(board, san)
+        except IllegalMoveError as error:
+            return {'headers': headers, 'plies': ply, 'illegal': san, 'error': str(error)}
+        board.move(piece, move)
+    return {'headers': headers, 'plies': len(moves), 'illegal': None, 'error': None}
+
+
+def replay_file(source, workers=None, chunk=256):
+    '''Проверяет все партии потока в пуле процессов; в памяти не больше chunk * workers партий'''
+    workers = workers or multiprocessing.cpu_count()
+    games = read_games(source)
+    with multiprocessing.Pool(workers) as pool:
+        while True:
+            batch = list(itertools.islice(games, chunk * workers))
+            if not batch:
+                break
+            yield from pool.imap(replay, batch, chunksize=chunk)
+
+
+def game_result(board):
+    '''Результат по позиции: мат, пат или партия не закончена'''
+    color = board.next_player
+    if board.legal_moves(color):
+        return '*'
+    if not board.king_in_check(color):
+        return '1/2-1/2'
+    return '0-1' if color == 'white' else '1-0'
+
+
+def to_pgn(board, headers=None):
+    '''Запись партии сыгранной на доске (по истории ходов) в PGN'''
+    #возвращаемся к началу партии на копии доски и идем вперед записывая ходы
+    start = copy.deepcopy(board)
+    moves = []
+    while start._history:
+        moves.append(start._history[-1][1])
+        start.unmake_move()
+    moves.reverse()
+
+    #результат можно передать в заголовках (например если партия присуждена)
+    tags = {'Event': '?', 'Site': '?', 'Date': '????.??.??', 'Round': '?', 'White': '?', 'Black': '?', 'Result': game_result(board)}
+    tags.update(headers or {})
+    result = tags['Result']
+    fen = start.fen()
+    if fen != START_FEN:
+        tags['SetUp'] = '1'
+        tags['FEN'] = fen
+
+    text = []
+    number = start.counters[1]
+    for index, move in enumerate(moves):
+        if start.next_player == 'white':
+            text.append(f'{number}.')
+        elif index == 0:
+            text.append(f'{number}...')
+        text.append(to_san(start, move))
+        if start.next_player == 'black':
+            number += 1
+        start.make_move(start.squares[move.initial.row][move.initial.col].piece, move)
+    text.append(result)
+
+    #строки ходов не длиннее 80 символов
+    lines = ['']
+    for token in text:
+        if lines[-1] and len(lines[-1]) + 1 + len(token) > 80:
+            lines.append('')
+        lines[-1] = f'{lines[-1]} {token}' if lines[-1] else token
+
+    header = '\n'.join(f'[{tag} "{value}"]' for tag, value in tags.items())
+    return header + '\n\n' + '\n'.join(lines) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Проверка партий PGN по правилам доски в нескольких процессах')
+    parser.add_argument('input', help='файл PGN (- для stdin)')
+    parser.add_argument('--workers', type=int, help='число процессов (по умолчанию все ядра)')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', errors='replace')
+    start = time.perf_counter()
+    games = plies = illegal = 0
+    try:
+        for report in replay_file(source, args.workers):
+            games += 1
+            plies += report['plies']
+            if report['illegal'] is not None:
+                illegal += 1
+                headers = report['headers']
+                print(f'game {games} ({headers.get("White", "?")} - {headers.get("Black", "?")}, {headers.get("Date", "?")}): '
+                      f'ply {report["plies"] + 1} {report["illegal"]}: {report["error"]}')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    elapsed = time.perf_counter() - start
+    print(f'{games} games, {plies} plies, {illegal} with illegal moves in {elapsed:.1f} s '
+          f'({games / elapsed if elapsed else 0:.1f} games/s)')
+
+
+if __name__ == '__main__':
+    main()
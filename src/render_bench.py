@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+
+#окно не нужно: рисуем в память
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from const import *
+from game import Game
+
+
+def _setup():
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    game = Game()
+
+    #берем пешку чтобы рисовались и подсказки, и перетаскиваемая фигура
+    piece = game.board.squares[6][4].piece
+    game.dragger.save_initial((4 * SQSIZE, 6 * SQSIZE))
+    game.dragger.drag_piece(piece)
+    game.mark_moves(piece)
+    return screen, game
+
+
+def bench(frames=300, mode='dirty'):
+    '''Кадров в секунду при перетаскивании фигуры: полная перерисовка (full) или только изменившихся клеток (dirty)'''
+    screen, game = _setup()
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        game.dragger.update_mouse((frame % WIDTH, HEIGHT // 2))
+        game.set_hover(HEIGHT // 2 // SQSIZE, frame % WIDTH // SQSIZE)
+        if mode == 'full':
+            game.show_bg(screen)
+            game.show_last_move(screen)
+            game.show_moves(screen)
+            game.show_pieces(screen)
+            game.show_hover(screen)
+            game.dragger.update_blit(screen)
+            pygame.display.update()
+        else:
+            rects = game.render(screen)
+            if rects:
+                pygame.display.update(rects)
+    elapsed = time.perf_counter() - start
+
+    pygame.quit()
+    return frames / elapsed
+
+
+def idle_cpu(seconds=2.0):
+    '''Доля процессора которую тратит цикл с ограничением кадров когда ничего не происходит'''
+    screen, game = _setup()
+    clock = pygame.time.Clock()
+
+    start, cpu = time.perf_counter(), time.process_time()
+    while time.perf_counter() - start < seconds:
+        pygame.event.get()
+        rects = game.render(screen)
+        if rects:
+            pygame.display.update(rects)
+        clock.tick(FPS)
+    usage = (time.process_time() - cpu) / (time.perf_counter() - start)
+
+    pygame.quit()
+    return usage
+
+
+if __name__ == '__main__':
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    print(f'full redraw:  {bench(frames, "full"):.1f} fps')
+    print(f'dirty rects:  {bench(frames, "dirty"):.1f} fps')
+    print(f'idle CPU at {FPS} fps cap: {idle_cpu() * 100:.1f}%')
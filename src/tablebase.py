@@ -0,0 +1,284 @@
+import argparse
+import mmap
+import os
+import time
+from array import array
+
+from core.piece import *
+from core.board import Board
+
+
+#таблицы: сильная сторона (всегда белые в таблице) - король и одна фигура против одинокого короля
+TABLES = {'KQK': Queen, 'KRK': Rook, 'KPK': Pawn}
+#KPK ссылается на KQK (пешка превращается в ферзя), поэтому KQK строится первой
+ORDER = ('KQK', 'KRK', 'KPK')
+
+MAGIC = b'CTB1'
+#индекс: ((ход * 32 + король сильной стороны) * 64 + фигура) * 64 + король слабой стороны;
+#король сильной стороны всегда на вертикалях a-d (доска отражается), ход 0 - сильная сторона
+SIZE = 2 * 32 * 64 * 64
+
+#значение в таблице: 0 - ничья или невозможная позиция, иначе расстояние до мата в полуходах + 1;
+#нечетное расстояние - выигрывает тот кто ходит, четное (0 - мат уже стоит) - проигрывает
+DRAW = 0
+MAX_DTM = 254
+
+
+def index(stm, strong_king, piece, weak_king):
+    '''Индекс позиции по полям (row * 8 + col); если король сильной стороны справа - отражаем доску'''
+    if strong_king & 7 > 3:
+        strong_king ^= 7
+        piece ^= 7
+        weak_king ^= 7
+    return ((stm * 32 + (strong_king >> 3) * 4 + (strong_king & 7)) * 64 + piece) * 64 + weak_king
+
+
+def _positions():
+    #все комбинации полей, король сильной стороны - на вертикалях a-d
+    for stm in (0, 1):
+        for strong_king in range(64):
+            if strong_king & 7 > 3:
+                continue
+            for piece in range(64):
+                for weak_king in range(64):
+                    yield stm, strong_king, piece, weak_king
+
+
+class Generator:
+    '''Строит таблицу ретроградным анализом по правилам Board'''
+
+    def __init__(self, name, tables):
+        self.name = name
+        self.kind = TABLES[name]
+        #уже построенные таблицы (KQK для превращения пешки в KPK)
+        self.tables = tables
+        self.board = Board()
+        self.strong_king = King('white')
+        self.weak_king = King('black')
+        self.piece = self.kind('white')
+
+    def _setup(self, stm, strong_king, piece, weak_king):
+        #расставляет три фигуры на общей доске, None если позиция невозможна
+        if len({strong_king, piece, weak_king}) < 3:
+            return None
+        if abs((strong_king >> 3) - (weak_king >> 3)) <= 1 and abs((strong_king & 7) - (weak_king & 7)) <= 1:
+            return None
+        if self.kind is Pawn and piece >> 3 in (0, 7):
+            return None
+
+        board = self.board
+        for row in board.squares:
+            for square in row:
+                square.piece = None
+        for figure, sqr in ((self.strong_king, strong_king), (self.piece, piece), (self.weak_king, weak_king)):
+            board.squares[sqr >> 3][sqr & 7].piece = figure
+            figure.moved = True
+        if self.kind is Pawn:
+            self.piece.moved = piece >> 3 != 6
+            self.piece.en_passant = False
+        board.king_squares = {'white': divmod(strong_king, 8), 'black': divmod(weak_king, 8)}
+        board.en_passant_pawn = None
+        board.last_move = None
+        board._attacks = {}
+        board.next_player = 'white' if stm == 0 else 'black'
+
+        #сторона которая не ходит не может быть под шахом
+        if board.king_in_check('black' if stm == 0 else 'white'):
+            return None
+        return board
+
+    def _moves(self, stm, strong_king, piece, weak_king):
+        #ходы стороны которая ходит вместе с полями фигур
+        board = self.board
+        if stm == 0:
+            yield from ((self.strong_king, strong_king, move) for move in board.piece_moves(self.strong_king, strong_king >> 3, strong_king & 7))
+            yield from ((self.piece, piece, move) for move in board.piece_moves(self.piece, piece >> 3, piece & 7))
+        else:
+            yield from ((self.weak_king, weak_king, move) for move in board.piece_moves(self.weak_king, weak_king >> 3, weak_king & 7))
+
+    def _successor(self, stm, strong_king, piece, weak_king, figure, move):
+        #результат хода: ('index', индекс в этой таблице) или ('value', значение из другой таблицы)
+        final = move.final.row * 8 + move.final.col
+        if figure is self.weak_king:
+            if final == piece:
+                #фигура съедена - два короля, ничья
+                return 'value', DRAW
+            return 'index', index(0, strong_king, piece, final)
+        if figure is self.strong_king:
+            return 'index', index(1, final, piece, weak_king)
+        if self.kind is Pawn and final >> 3 == 0:
+            #превращение в ферзя - позиция из KQK, ходят черные
+            return 'value', self.tables['KQK'][index(1, strong_king, final, weak_king)]
+        return 'index', index(1, strong_king, final, weak_king)
+
+    def generate(self):
+        '''Возвращает bytearray значений для всех позиций'''
+        #ходы внутри таблицы которые еще не оказались выигрышными для соперника
+        counts = array('i', bytes(4 * SIZE))
+        #из каких позиций таблицы можно попасть в данную
+        predecessors = [None] * SIZE
+        #есть ход в ничью или в проигрыш соперника вне таблицы - позиция не проигрывает
+        escapes = bytearray(SIZE)
+        #самый долгий проигрыш через ходы вне таблицы (расстояние + 1)
+        external = bytearray(SIZE)
+        #очереди позиций по расстоянию до мата: (индекс, выигрыш ли)
+        buckets = [[] for dtm in range(MAX_DTM + 1)]
+
+        for position in _positions():
+            board = self._setup(*position)
+            if board is None:
+                continue
+            i = index(*position)
+            moves = list(self._moves(*position))
+            for figure, sqr, move in moves:
+                kind, value = self._successor(*position, figure, move)
+                if kind == 'index':
+                    counts[i] += 1
+                    if predecessors[value] is None:
+                        predecessors[value] = array('i')
+                    predecessors[value].append(i)
+                elif value == DRAW:
+                    escapes[i] = 1
+                elif (value - 1) % 2:
+                    #соперник выигрывает за value - 1 полуходов
+                    external[i] = max(external[i], value)
+                else:
+                    #соперник проигрывает - выигрыш на полуход позже
+                    escapes[i] = 1
+                    if value <= MAX_DTM:
+                        buckets[value].append((i, True))
+
+            if counts[i] == 0 and not escapes[i]:
+                if external[i]:
+                    #все ходы ведут в проигрыш вне таблицы
+                    if external[i] <= MAX_DTM:
+                        buckets[external[i]].append((i, False))
+                elif not moves and board.king_in_check(board.next_player):
+                    #мат
+                    buckets[0].append((i, False))
+
+        #обратный анализ: от матов к позициям перед ними, по возрастанию расстояния
+        values = bytearray(SIZE)
+        for dtm in range(MAX_DTM + 1):
+            for i, win in buckets[dtm]:
+                if values[i]:
+                    continue
+                values[i] = dtm + 1
+                if dtm == MAX_DTM:
+                    continue
+                for p in predecessors[i] or ():
+                    if values[p]:
+                        continue
+                    if not win:
+                        #есть ход в проигрыш соперника
+                        buckets[dtm + 1].append((p, True))
+                    else:
+                        #все ходы выигрывают у нас - проигрыш
+                        counts[p] -= 1
+                        if counts[p] == 0 and not escapes[p]:
+                            loss = max(dtm + 1, external[p])
+                            if loss <= MAX_DTM:
+                                buckets[loss].append((p, False))
+        return values
+
+
+def write(path, values):
+    with open(path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(values)
+
+
+class Tablebases:
+    '''Чтение таблиц через mmap и оценка позиций с тремя фигурами'''
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.tables = {}
+        self._files = []
+        for name in TABLES:
+            path = os.path.join(directory, f'{name}.tb')
+            if not os.path.exists(path):
+                continue
+            file = open(path, 'rb')
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            if data[:len(MAGIC)] != MAGIC or len(data) != len(MAGIC) + SIZE:
+                data.close()
+                file.close()
+                continue
+            self._files.append(file)
+            self.tables[name] = data
+
+    #в другой процесс передается только каталог, файлы отображаются заново
+    def __getstate__(self):
+        return {'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'])
+
+    def close(self):
+        for data in self.tables.values():
+            data.close()
+        for file in self._files:
+            file.close()
+        self.tables = {}
+        self._files = []
+
+    def probe(self, board):
+        '''Значение таблицы (расстояние до мата + 1, 0 - ничья) со стороны того кто ходит или None'''
+        if board.piece_count != 3 or not self.tables:
+            return None
+
+        kings = {}
+        piece = piece_sqr = None
+        for row in range(8):
+            for col in range(8):
+                figure = board.squares[row][col].piece
+                if figure is None:
+                    continue
+                if isinstance(figure, King):
+                    kings[figure.color] = row * 8 + col
+                else:
+                    piece, piece_sqr = figure, row * 8 + col
+
+        name = 'K' + {Queen: 'Q', Rook: 'R', Pawn: 'P'}.get(type(piece), '?') + 'K'
+        data = self.tables.get(name)
+        if data is None:
+            return None
+
+        strong = piece.color
+        weak = 'black' if strong == 'white' else 'white'
+        stm = 0 if board.next_player == strong else 1
+        strong_king, weak_king = kings[strong], kings[weak]
+        if strong == 'black':
+            #в таблице сильная сторона - белые: отражаем доску по горизонтали
+            strong_king, piece_sqr, weak_king = strong_king ^ 56, piece_sqr ^ 56, weak_king ^ 56
+        return data[len(MAGIC) + index(stm, strong_king, piece_sqr, weak_king)]
+
+
+def generate(directory, names=ORDER):
+    '''Строит таблицы и пишет их в каталог'''
+    os.makedirs(directory, exist_ok=True)
+    tables = {}
+    for name in ORDER:
+        if name not in names and not (name == 'KQK' and 'KPK' in names):
+            continue
+        start = time.perf_counter()
+        values = Generator(name, tables).generate()
+        tables[name] = values
+        write(os.path.join(directory, f'{name}.tb'), values)
+        wins = sum(1 for value in values if value and (value - 1) % 2)
+        longest = max(values) - 1
+        print(f'{name}: {wins} wins for the side to move, longest mate {longest} plies, {time.perf_counter() - start:.1f} s')
+    return tables
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Генерация таблиц эндшпиля KQK, KRK, KPK')
+    parser.add_argument('directory', nargs='?', default='assets/tablebases')
+    parser.add_argument('--tables', nargs='+', default=list(ORDER), choices=ORDER)
+    args = parser.parse_args(argv)
+    generate(args.directory, args.tables)
+
+
+if __name__ == '__main__':
+    main()
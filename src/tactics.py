@@ -0,0 +1,77 @@
+import argparse
+import time
+
+from core import load_fen, parse_san, IllegalMoveError
+from engine import Engine
+from epd import read_epd
+
+
+TACTICS_PATH = 'assets/tactics/wac.epd'
+
+
+def expected_moves(board, operations):
+    '''Ходы из операций bm (лучший ход) и am (ход которого надо избегать) в записи SAN'''
+    moves = {}
+    for opcode in ('bm', 'am'):
+        moves[opcode] = []
+        for san in operations.get(opcode, '').split():
+            try:
+                moves[opcode].append(parse_san(board, san)[1])
+            except IllegalMoveError:
+                pass
+    return moves['bm'], moves['am']
+
+
+def solve(engine, fen, operations, **limits):
+    '''Ищет ход в позиции и проверяет его по bm/am: (решено ли, ход)'''
+    board, color = load_fen(fen)
+    best, avoid = expected_moves(board, operations)
+    move = engine.search(board, **limits)
+    solved = move in best if best else move not in avoid
+    return solved, move
+
+
+def run(positions, limits, configs):
+    '''Решает позиции каждым движком; возвращает по движку (решено, позиций, узлов, узлов форсированного поиска, отброшено SEE, секунд)'''
+    totals = {name: [0, 0, 0, 0, 0, 0.0] for name in configs}
+    for fen, operations in positions:
+        row = []
+        for name, options in configs.items():
+            engine = Engine(time_limit=0, **options)
+            start = time.perf_counter()
+            solved, move = solve(engine, fen, operations, **limits)
+            total = totals[name]
+            total[0] += solved
+            total[1] += 1
+            total[2] += engine.nodes
+            total[3] += engine.q_nodes
+            total[4] += engine.see_pruned
+            total[5] += time.perf_counter() - start
+            row.append(f'{name} {str(move):5} {"+" if solved else "-"} {engine.nodes:8}')
+        print(f'{operations.get("id", "?"):10} {operations.get("bm", operations.get("am", "")):8} ' + '   '.join(row))
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Тактические позиции EPD (bm/am): решения и число узлов без форсированного поиска и с ним')
+    parser.add_argument('input', nargs='?', default=TACTICS_PATH, help='файл EPD')
+    parser.add_argument('--depth', type=int, default=4, help='глубина поиска')
+    parser.add_argument('--time', type=float, help='секунд на позицию вместо глубины')
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding='utf-8') as file:
+        positions = list(read_epd(file))
+    limits = {'time_limit': args.time, 'depth': None if args.time else args.depth}
+    configs = {'plain': {'quiescence': False}, 'qs+see': {'quiescence': True}}
+    totals = run(positions, limits, configs)
+
+    for name, (solved, count, nodes, q_nodes, pruned, seconds) in totals.items():
+        print(f'{name:7} solved {solved}/{count}  nodes {nodes}  quiescence nodes {q_nodes}  '
+              f'captures pruned by SEE {pruned}  {seconds:.1f} s')
+    plain, quiet = totals['plain'], totals['qs+see']
+    if plain[2]:
+        print(f'nodes x{quiet[2] / plain[2]:.2f}, solved {quiet[0] - plain[0]:+d}')
+
+
+if __name__ == '__main__':
+    main()
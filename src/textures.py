@@ -0,0 +1,22 @@
+import os
+import pygame
+
+
+class Textures:
+    '''Картинки фигур: каждая загружается с диска один раз и хранится в формате экрана'''
+
+    def __init__(self):
+        self._images = {}
+
+    def get(self, piece, size=80):
+        key = (piece.color, piece.name, size)
+        img = self._images.get(key)
+        if img is None:
+            img = pygame.image.load(
+                os.path.join(f'assets/images/imgs-{size}px/{piece.color}_{piece.name}.png')
+            )
+            #convert_alpha возможен только когда окно уже создано
+            if pygame.display.get_surface() is not None:
+                img = img.convert_alpha()
+            self._images[key] = img
+        return img
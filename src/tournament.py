@@ -0,0 +1,296 @@
+import argparse
+import math
+import multiprocessing
+import random
+import sys
+import time
+
+from core import Board, Pawn, Knight, Bishop, King
+from core.evaluation import evaluate
+from engine import Engine, MATE, MAX_PLY
+from pgn import to_pgn
+
+
+#параметры движка в строке вида "depth=3,nodes=5000,time=0.1,tt=16,tb=1"
+OPTIONS = {'time': ('time_limit', float), 'depth': ('depth', int), 'nodes': ('nodes', int), 'tt': ('tt_size', int), 'tb': ('tablebases', int), 'qs': ('quiescence', int)}
+
+
+def parse_engine(spec):
+    '''Параметры Engine из строки "depth=3,nodes=5000"; без time поиск не ограничен по времени'''
+    options = {'time_limit': 0}
+    for part in filter(None, spec.split(',')):
+        name, _, value = part.partition('=')
+        if name.strip() not in OPTIONS:
+            raise ValueError(f'неизвестный параметр движка: {name}')
+        key, kind = OPTIONS[name.strip()]
+        options[key] = kind(value)
+    return options
+
+
+def random_openings(count, plies=6, seed=0, balance=150):
+    '''count разных позиций после plies случайных полуходов с оценкой не больше balance'''
+    rng = random.Random(seed)
+    fens = []
+    seen = set()
+    attempts = 0
+    while len(fens) < count and attempts < count * 100:
+        attempts += 1
+        board = Board()
+        for ply in range(plies):
+            moves = board.legal_moves(board.next_player)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            board.make_move(board.squares[move.initial.row][move.initial.col].piece, move)
+        else:
+            if board.legal_moves(board.next_player) and abs(evaluate(board)) <= balance:
+                fen = board.fen()
+                if fen not in seen:
+                    seen.add(fen)
+                    fens.append(fen)
+    return fens
+
+
+def read_openings(path):
+    '''Позиции из файла FEN/EPD (по одной в строке)'''
+    from epd import read_epd
+    with open(path, encoding='utf-8') as file:
+        return [fen + ' 0 1' for fen, operations in read_epd(file)]
+
+
+def insufficient_material(board):
+    #два короля или король с легкой фигурой против короля
+    if board.piece_count > 3:
+        return False
+    for row in board.squares:
+        for square in row:
+            if square.piece is not None and not isinstance(square.piece, (King, Knight, Bishop)):
+                return False
+    return True
+
+
+#движки процесса пула: создаются один раз, таблица позиций очищается перед каждой партией
+_engines = {}
+_tablebases = None
+
+
+def _init(tablebase_dir):
+    global _tablebases
+    if tablebase_dir:
+        from tablebase import Tablebases
+        _tablebases = Tablebases(tablebase_dir)
+
+
+def _engine(spec):
+    if spec not in _engines:
+        options = parse_engine(spec)
+        tablebases = _tablebases if options.pop('tablebases', 0) else None
+        _engines[spec] = Engine(tablebases=tablebases, **options)
+    engine = _engines[spec]
+    engine.tt.clear()
+    engine.ordering.clear()
+    return engine
+
+
+def adjudicate(board, halfmoves, tablebases):
+    '''Результат (строка PGN, причина) если партия закончена или ее исход известен, иначе None'''
+    color = board.next_player
+    winner = '0-1' if color == 'white' else '1-0'
+    loser = '1-0' if color == 'white' else '0-1'
+    if not board.legal_moves(color):
+        return (winner, 'checkmate') if board.king_in_check(color) else ('1/2-1/2', 'stalemate')
+    if board.repetitions() >= 2:
+        return '1/2-1/2', 'repetition'
+    if halfmoves >= 100:
+        return '1/2-1/2', 'fifty moves'
+    if insufficient_material(board):
+        return '1/2-1/2', 'insufficient material'
+    if tablebases is not None and board.piece_count <= 3:
+        value = tablebases.probe(board)
+        if value is not None:
+            #value - 1 полуходов до мата: нечетное - выигрывает тот кто ходит
+            if not value:
+                return '1/2-1/2', 'tablebase'
+            return (loser if (value - 1) % 2 else winner), 'tablebase'
+    return None
+
+
+def play_game(task):
+    '''Одна партия движок против движка из позиции FEN; возвращает результат со стороны белых'''
+    number, fen, white, black, max_plies, save_pgn = task
+    engines = {'white': _engine(white[1]), 'black': _engine(black[1])}
+    board = Board.from_fen(fen)
+    halfmoves = board.counters[0]
+    start = time.perf_counter()
+    nodes = {'white': 0, 'black': 0}
+
+    outcome = None
+    while outcome is None:
+        outcome = adjudicate(board, halfmoves, _tablebases)
+        if outcome is not None:
+            break
+        if len(board._history) >= max_plies:
+            outcome = '1/2-1/2', 'move limit'
+            break
+
+        color = board.next_player
+        engine = engines[color]
+        move = engine.search(board)
+        nodes[color] += engine.nodes
+        piece = board.squares[move.initial.row][move.initial.col].piece
+        capture = board.squares[move.final.row][move.final.col].has_piece()
+        halfmoves = 0 if capture or isinstance(piece, Pawn) else halfmoves + 1
+        board.make_move(piece, move)
+
+        #найденный поиском мат уже не изменится - партию можно не доигрывать
+        if engine.completed_depth and abs(engine.score) >= MATE - MAX_PLY:
+            mover_wins = engine.score > 0
+            outcome = ('1-0' if (color == 'white') == mover_wins else '0-1'), 'mate score'
+
+    result, reason = outcome
+    report = {
+        'number': number, 'white': white[0], 'black': black[0], 'result': result, 'reason': reason,
+        'plies': len(board._history), 'time': time.perf_counter() - start, 'nodes': nodes,
+    }
+    if save_pgn:
+        report['pgn'] = to_pgn(board, {
+            'Event': 'Chess-AI tournament', 'Round': str(number),
+            'White': f'{white[0]} ({white[1]})', 'Black': f'{black[0]} ({black[1]})',
+            'Result': result, 'Termination': reason,
+        })
+    return report
+
+
+def elo(wins, draws, losses):
+    '''Разница Elo и половина 95% доверительного интервала по числу побед, ничьих, поражений'''
+    games = wins + draws + losses
+    if not games:
+        return 0.0, float('inf')
+    score = (wins + draws / 2) / games
+    if score <= 0 or score >= 1:
+        return (float('inf') if score >= 1 else float('-inf')), float('inf')
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = 1.96 * math.sqrt(variance / games)
+
+    def to_elo(s):
+        s = min(max(s, 1e-6), 1 - 1e-6)
+        return -400 * math.log10(1 / s - 1)
+    return to_elo(score), (to_elo(score + margin) - to_elo(score - margin)) / 2
+
+
+def llr(wins, draws, losses, elo0, elo1):
+    '''Логарифм отношения правдоподобия гипотез elo1 и elo0 (приближение для трех исходов)'''
+    games = wins + draws + losses
+    if not wins or not losses:
+        #без побед или поражений дисперсию не оценить
+        return 0.0
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    s0 = 1 / (1 + 10 ** (-elo0 / 400))
+    s1 = 1 / (1 + 10 ** (-elo1 / 400))
+    return games * (s1 - s0) * (2 * score - s0 - s1) / (2 * variance)
+
+
+def sprt_bounds(alpha, beta):
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+def schedule(openings, first, second, rounds, max_plies, save_pgn):
+    #каждая позиция играется дважды со сменой цвета
+    number = 0
+    for round in range(rounds):
+        for fen in openings:
+            for white, black in ((first, second), (second, first)):
+                number += 1
+                yield number, fen, white, black, max_plies, save_pgn
+
+
+def run(first, second, openings, workers=None, rounds=1, max_plies=400, tablebase_dir=None,
+        elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05, output=sys.stdout, pgn=None):
+    '''Играет матч в пуле процессов, печатает результаты по мере готовности; останавливается по SPRT'''
+    first, second = ('first', first), ('second', second)
+    workers = workers or multiprocessing.cpu_count()
+    lower, upper = sprt_bounds(alpha, beta)
+    #счет со стороны первого движка
+    wins = draws = losses = 0
+    verdict = None
+    start = time.perf_counter()
+
+    tasks = schedule(openings, first, second, rounds, max_plies, pgn is not None)
+    with multiprocessing.Pool(workers, initializer=_init, initargs=(tablebase_dir,)) as pool:
+        for report in pool.imap_unordered(play_game, tasks):
+            result = report['result']
+            if result == '1/2-1/2':
+                draws += 1
+            elif (result == '1-0') == (report['white'] == 'first'):
+                wins += 1
+            else:
+                losses += 1
+            if pgn is not None:
+                pgn.write(report['pgn'] + '\n')
+
+            difference, margin = elo(wins, draws, losses)
+            ratio = llr(wins, draws, losses, elo0, elo1)
+            print(f'game {report["number"]:4} {report["white"]:>6} - {report["black"]:<6} {result:7} '
+                  f'{report["reason"]:21} {report["plies"]:3} plies {report["time"]:6.1f} s | '
+                  f'+{wins} ={draws} -{losses}  elo {difference:+.1f} +/- {margin:.1f}  llr {ratio:+.2f} [{lower:.2f}, {upper:.2f}]',
+                  file=output, flush=True)
+
+            if ratio >= upper:
+                verdict = 'H1'
+            elif ratio <= lower:
+                verdict = 'H0'
+            if verdict:
+                pool.terminate()
+                break
+
+    elapsed = time.perf_counter() - start
+    difference, margin = elo(wins, draws, losses)
+    print(f'{wins + draws + losses} games in {elapsed:.1f} s: +{wins} ={draws} -{losses}, '
+          f'elo {difference:+.1f} +/- {margin:.1f}, sprt [{elo0}, {elo1}]: '
+          f'{ {"H1": "H1 accepted (first is stronger)", "H0": "H0 accepted (no gain)"}.get(verdict, "inconclusive") }',
+          file=output)
+    return wins, draws, losses, verdict
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Матч движок против движка в нескольких процессах со статистикой Elo и SPRT')
+    parser.add_argument('--first', default='nodes=5000', help='параметры первого движка: time=, depth=, nodes=, tt=, tb=, qs=')
+    parser.add_argument('--second', default='nodes=5000', help='параметры второго движка')
+    parser.add_argument('--games', type=int, default=100, help='число стартовых позиций (каждая играется двумя цветами)')
+    parser.add_argument('--openings', help='файл FEN/EPD со стартовыми позициями (по умолчанию случайные)')
+    parser.add_argument('--plies', type=int, default=6, help='полуходов в случайных дебютах')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rounds', type=int, default=1, help='сколько раз повторить список позиций')
+    parser.add_argument('--workers', type=int, help='число процессов (по умолчанию все ядра)')
+    parser.add_argument('--max-plies', type=int, default=400, help='ничья после стольких полуходов')
+    parser.add_argument('--tablebases', help='каталог таблиц эндшпиля для присуждения результата')
+    parser.add_argument('--elo0', type=float, default=0.0)
+    parser.add_argument('--elo1', type=float, default=10.0)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--pgn', help='файл для записи партий')
+    args = parser.parse_args(argv)
+
+    for spec in (args.first, args.second):
+        try:
+            parse_engine(spec)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.openings:
+        openings = read_openings(args.openings)[:args.games]
+    else:
+        openings = random_openings(args.games, args.plies, args.seed)
+
+    pgn = open(args.pgn, 'w', encoding='utf-8') if args.pgn else None
+    try:
+        run(args.first, args.second, openings, args.workers, args.rounds, args.max_plies, args.tablebases,
+            args.elo0, args.elo1, args.alpha, args.beta, pgn=pgn)
+    finally:
+        if pgn is not None:
+            pgn.close()
+
+
+if __name__ == '__main__':
+    main()
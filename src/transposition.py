@@ -0,0 +1,97 @@
+from array import array
+from multiprocessing import RawArray
+
+
+#тип оценки в таблице
+EXACT, LOWER, UPPER = 0, 1, 2
+
+#запись = ключ (8 байт) + упакованные данные (8 байт)
+ENTRY_SIZE = 16
+
+#упаковка данных: ход 12 бит | тип 2 бита | глубина 8 бит | поколение 8 бит | оценка 32 бита
+MOVE_MASK = (1 << 12) - 1
+SCORE_OFFSET = 1 << 31
+
+
+def table_size(size_mb):
+    '''Число записей - степень двойки чтобы индекс брался маской'''
+    entries = max(1, size_mb * 1024 * 1024 // ENTRY_SIZE)
+    return 1 << (entries.bit_length() - 1)
+
+
+def shared_buffers(size_mb):
+    '''Ключи и данные в общей памяти процессов (передаются в multiprocessing.Process)'''
+    size = table_size(size_mb)
+    return RawArray('Q', size), RawArray('Q', size)
+
+
+class TranspositionTable:
+    '''Таблица позиций фиксированного размера, индекс - младшие биты ключа Zobrist'''
+
+    def __init__(self, size_mb=16, shared=None):
+        self.size = table_size(size_mb)
+        self.mask = self.size - 1
+        #shared - буферы из shared_buffers: таблица общая для нескольких процессов
+        self.shared = shared
+        if shared is None:
+            self.clear()
+        else:
+            #подключение к общей таблице ее не стирает
+            self.keys, self.data = (memoryview(buffer).cast('B').cast('Q') for buffer in shared)
+            self.generation = 0
+
+    def new_search(self):
+        #записи прошлых поисков вытесняются в первую очередь
+        self.generation = (self.generation + 1) & 255
+
+    def clear(self):
+        if self.shared is None:
+            self.keys = array('Q', bytes(8 * self.size))
+            self.data = array('Q', bytes(8 * self.size))
+        else:
+            self.keys[:] = self.data[:] = array('Q', bytes(8 * self.size))
+        self.generation = 0
+
+    def probe(self, key):
+        '''Возвращает (depth, score, bound, move) или None; move - код from | to << 6 (0 - нет хода)'''
+        index = key & self.mask
+        data = self.data[index]
+        #ключ хранится как key ^ data: запись которую другой процесс записал наполовину не совпадет
+        if not data or self.keys[index] ^ data != key:
+            return None
+        return (
+            (data >> 14) & 255,
+            (data >> 32) - SCORE_OFFSET,
+            (data >> 12) & 3,
+            data & MOVE_MASK,
+        )
+
+    def store(self, key, depth, score, bound, move=0):
+        index = key & self.mask
+        old = self.data[index]
+        same = old and self.keys[index] ^ old == key
+
+        #замещение: пустая ячейка, та же позиция, старое поколение или не меньшая глубина
+        if old and not same:
+            if (old >> 22) & 255 == self.generation and (old >> 14) & 255 > depth:
+                return
+
+        #не теряем лучший ход позиции если новый поиск его не нашел
+        if not move and same:
+            move = old & MOVE_MASK
+
+        data = (
+            (move & MOVE_MASK)
+            | bound << 12
+            | max(0, min(depth, 255)) << 14
+            | self.generation << 22
+            | (int(score) + SCORE_OFFSET) << 32
+        )
+        self.keys[index] = key ^ data
+        self.data[index] = data
+
+    def hashfull(self):
+        '''Заполненность таблицы в промилле (по первым 1000 ячейкам)'''
+        sample = min(1000, self.size)
+        used = sum(1 for index in range(sample) if (self.data[index] >> 22) & 255 == self.generation and self.data[index])
+        return used * 1000 // sample
@@ -0,0 +1,244 @@
+import copy
+import os
+import sys
+import threading
+
+from const import BOOK_PATH, TABLEBASE_PATH
+from core import Board, Move, Pawn
+from engine import Engine, MATE, MAX_PLY
+from transposition import TranspositionTable
+
+
+NAME = 'Chess-AI'
+AUTHOR = 'daniilcehmestrenko'
+#каталог проекта: GUI запускает движок из своего каталога
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+#запас времени на передачу хода (секунды) и число ходов до контроля если GUI его не прислал
+MOVE_OVERHEAD = 0.05
+MOVES_TO_GO = 30
+
+
+def parse_move(board, text):
+    '''Ход в записи UCI (e2e4, e7e8q) если он возможен в позиции, иначе None'''
+    if len(text) not in (4, 5) or text[0] not in 'abcdefgh' or text[2] not in 'abcdefgh' \
+            or text[1] not in '12345678' or text[3] not in '12345678':
+        return None
+    move = Move.get(8 - int(text[1]), 'abcdefgh'.index(text[0]), 8 - int(text[3]), 'abcdefgh'.index(text[2]))
+    if move not in board.legal_moves(board.next_player):
+        return None
+    return move
+
+
+def format_move(board, move):
+    #пешка на последней горизонтали всегда становится ферзем
+    piece = board.squares[move.initial.row][move.initial.col].piece
+    if isinstance(piece, Pawn) and move.final.row in (0, 7):
+        return f'{move}q'
+    return str(move)
+
+
+def format_pv(board, moves):
+    '''Главный вариант в записи UCI: каждый ход пишется в позиции из которой он делается'''
+    texts = []
+    for move in moves:
+        texts.append(format_move(board, move))
+        board.make_move(board.squares[move.initial.row][move.initial.col].piece, move)
+    for move in moves:
+        board.unmake_move()
+    return ' '.join(texts)
+
+
+def format_score(score):
+    if score >= MATE - MAX_PLY:
+        return f'mate {(MATE - score + 1) // 2}'
+    if score <= -MATE + MAX_PLY:
+        return f'mate -{(MATE + score) // 2}'
+    return f'cp {score}'
+
+
+def time_limit(board, options):
+    '''Время на ход в секундах по параметрам go; 0 - без ограничения по времени'''
+    if 'movetime' in options:
+        return max(options['movetime'] / 1000 - MOVE_OVERHEAD, 0.01)
+    side = 'w' if board.next_player == 'white' else 'b'
+    if f'{side}time' not in options:
+        return 0
+    remaining = options[f'{side}time'] / 1000
+    increment = options.get(f'{side}inc', 0) / 1000
+    moves = options.get('movestogo') or MOVES_TO_GO
+    budget = remaining / moves + increment * 3 / 4
+    #не больше половины оставшегося времени
+    return max(min(budget, remaining / 2 - MOVE_OVERHEAD), 0.01)
+
+
+class UCI:
+    '''Движок по протоколу UCI: команды из stdin, ответы в stdout; поиск идет в отдельном потоке'''
+
+    def __init__(self, output=sys.stdout):
+        self.output = output
+        self.board = Board()
+        tablebase_dir = os.path.join(ROOT, TABLEBASE_PATH)
+        tablebases = None
+        if os.path.isdir(tablebase_dir):
+            from tablebase import Tablebases
+            tablebases = Tablebases(tablebase_dir)
+        self.hash_size = 16
+        self.engine = Engine(time_limit=0, tt_size=self.hash_size, tablebases=tablebases)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def send(self, line):
+        #строки пишут и поток поиска, и поток чтения команд
+        with self._lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def handle(self, line):
+        '''Выполняет одну команду; False если пора выходить'''
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, args = tokens[0], tokens[1:]
+
+        if command == 'uci':
+            self.send(f'id name {NAME}')
+            self.send(f'id author {AUTHOR}')
+            self.send(f'option name Hash type spin default {self.hash_size} min 1 max 1024')
+            self.send('option name OwnBook type check default false')
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'setoption':
+            self.wait()
+            self.set_option(args)
+        elif command == 'ucinewgame':
+            self.wait()
+            self.engine.tt.clear()
+            self.engine.ordering.clear()
+            self.board = Board()
+        elif command == 'position':
+            self.wait()
+            self.position(args)
+        elif command == 'go':
+            self.wait()
+            self.go(args)
+        elif command == 'stop':
+            self.wait()
+        elif command == 'd':
+            self.send(self.board.fen())
+        elif command == 'quit':
+            self.wait()
+            return False
+        return True
+
+    def set_option(self, args):
+        text = ' '.join(args)
+        name, _, value = text.partition(' value ')
+        name = name.replace('name', '', 1).strip().lower()
+        value = value.strip()
+        if name == 'hash':
+            self.hash_size = max(1, int(value))
+            self.engine.tt = TranspositionTable(self.hash_size)
+        elif name == 'ownbook':
+            book_path = os.path.join(ROOT, BOOK_PATH)
+            if value.lower() == 'true' and os.path.exists(book_path):
+                from book import OpeningBook
+                self.engine.book = OpeningBook(book_path)
+            else:
+                self.engine.book = None
+
+    def position(self, args):
+        if not args:
+            return
+        if args[0] == 'startpos':
+            board = Board()
+            rest = args[1:]
+        elif args[0] == 'fen':
+            fields = []
+            rest = args[1:]
+            while rest and rest[0] != 'moves':
+                fields.append(rest.pop(0))
+            try:
+                board = Board.from_fen(' '.join(fields))
+            except (ValueError, IndexError, KeyError):
+                self.send(f'info string invalid fen: {" ".join(fields)}')
+                return
+        else:
+            return
+
+        if rest and rest[0] == 'moves':
+            for text in rest[1:]:
+                move = parse_move(board, text)
+                if move is None:
+                    self.send(f'info string illegal move: {text}')
+                    break
+                if len(text) == 5 and text[4] != 'q':
+                    self.send(f'info string underpromotion {text} is played as a queen promotion')
+                board.make_move(board.squares[move.initial.row][move.initial.col].piece, move)
+        self.board = board
+
+    def go(self, args):
+        options = {}
+        infinite = False
+        names = ('depth', 'nodes', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo')
+        for index, token in enumerate(args):
+            if token in names and index + 1 < len(args):
+                options[token] = int(args[index + 1])
+            elif token == 'infinite':
+                infinite = True
+
+        limits = {
+            'time_limit': 0 if infinite else time_limit(self.board, options),
+            'depth': options.get('depth'),
+            'nodes': options.get('nodes'),
+        }
+        self._stop = threading.Event()
+        #у потока поиска своя копия доски - команды position его не задевают
+        self._thread = threading.Thread(
+            target=self._search,
+            args=(copy.deepcopy(self.board), limits, infinite, self._stop),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def wait(self):
+        '''Останавливает поиск (если он идет) и ждет пока поток выведет bestmove'''
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _search(self, board, limits, infinite, stop):
+        engine = self.engine
+
+        def info(engine, depth, seconds):
+            pv = format_pv(board, engine.pv(board))
+            nps = int(engine.nodes / seconds) if seconds else 0
+            self.send(f'info depth {depth} score {format_score(engine.score)} nodes {engine.nodes} '
+                      f'nps {nps} time {int(seconds * 1000)} hashfull {engine.tt.hashfull()} pv {pv}')
+
+        engine.info = info
+        try:
+            move = engine.search(board, stop_event=stop, **limits)
+        finally:
+            engine.info = None
+        #в режиме infinite ответ только после stop
+        if infinite:
+            stop.wait()
+        self.send(f'bestmove {format_move(board, move)}' if move is not None else 'bestmove 0000')
+
+
+def main(stdin=sys.stdin):
+    uci = UCI()
+    #команды читаются в главном потоке пока поиск идет в своем: stop прерывает его сразу
+    for line in stdin:
+        if not uci.handle(line):
+            break
+    else:
+        uci.wait()
+
+
+if __name__ == '__main__':
+    main()
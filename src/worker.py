@@ -0,0 +1,72 @@
+import copy
+import queue
+import threading
+
+
+class SearchWorker:
+    '''Поиск хода в отдельном потоке, результат забирается из очереди каждый кадр'''
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.thinking = False
+        #поиск на время соперника: ход не ждут пока соперник не сделает предсказанный ход
+        self.pondering = False
+        #ожидаемый ответ соперника (второй ход главного варианта последнего поиска)
+        self.ponder_move = None
+        self._results = queue.Queue()
+        self._thread = None
+        self._stop = threading.Event()
+        #номер текущего поиска: результаты отмененных поисков отбрасываются
+        self._search_id = 0
+
+    def start(self, board, ponder=False, **limits):
+        #прошлый поиск уже остановлен через cancel и завершится за доли секунды
+        if self._thread is not None:
+            self._thread.join()
+
+        self._search_id += 1
+        self._stop = threading.Event()
+        self.thinking = not ponder
+        self.pondering = ponder
+        #у потока своя копия доски - интерфейс продолжает работать с оригиналом
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._search_id, copy.deepcopy(board), self._stop, limits),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def poll(self):
+        '''Возвращает (True, ход) если поиск закончен, иначе (False, None)'''
+        while True:
+            try:
+                search_id, move, ponder_move = self._results.get_nowait()
+            except queue.Empty:
+                return False, None
+            if search_id == self._search_id and not self.pondering:
+                self.thinking = False
+                self.ponder_move = ponder_move
+                return True, move
+            if search_id == self._search_id:
+                #поиск на время соперника закончился сам (например нашел мат) - ответ ждет ponderhit
+                self._results.put((search_id, move, ponder_move))
+                return False, None
+
+    def ponderhit(self, time_limit):
+        '''Соперник сделал предсказанный ход: поиск продолжается уже с ограничением по времени'''
+        self.engine.ponderhit(time_limit)
+        self.pondering = False
+        self.thinking = True
+
+    def cancel(self):
+        '''Прерывает поиск не дожидаясь его конца'''
+        self._stop.set()
+        self._search_id += 1
+        self.thinking = False
+        self.pondering = False
+
+    def _run(self, search_id, board, stop, limits):
+        move = self.engine.search(board, stop_event=stop, **limits)
+        #ход соперника который ждем по главному варианту (таблица позиций та же)
+        pv = self.engine.pv(board, 2)
+        self._results.put((search_id, move, pv[1] if len(pv) > 1 else None))